@@ -3,9 +3,24 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+import time
 from pathlib import Path
 from typing import Iterable
 
+ADMIN_ACTIONS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS admin_actions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        action TEXT NOT NULL,
+        actor TEXT,
+        entity TEXT,
+        before_state TEXT,
+        after_state TEXT,
+        source_ip TEXT NOT NULL,
+        performed_at INTEGER NOT NULL
+    )
+"""
+
 SCHEMA = [
     """
     CREATE TABLE IF NOT EXISTS messages (
@@ -41,25 +56,7 @@ SCHEMA = [
         value TEXT NOT NULL
     )
     """,
-    """
-    CREATE TABLE IF NOT EXISTS admin_actions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        action TEXT NOT NULL,
-        actor TEXT,
-        entity TEXT,
-        before_state TEXT,
-        after_state TEXT,
-        source_ip TEXT NOT NULL,
-        performed_at TEXT NOT NULL
-    )
-    """,
-    """
-    CREATE TABLE IF NOT EXISTS admin_rate_limits (
-        source_ip TEXT PRIMARY KEY,
-        attempts INTEGER NOT NULL,
-        window_start TEXT NOT NULL
-    )
-    """,
+    ADMIN_ACTIONS_SCHEMA,
     """
     CREATE TABLE IF NOT EXISTS domain_policy (
         id INTEGER PRIMARY KEY,
@@ -121,25 +118,108 @@ SCHEMA = [
     """,
 ]
 
+# Created after the column migrations so older databases already have `status`.
+# The list queries order by received_at and filter on quarantine state or an exact
+# recipient; leading-wildcard LIKE filters still scan, but only the indexed range.
+INDEXES = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_messages_quarantined_received
+    ON messages(quarantined, received_at DESC, id DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_messages_status_received
+    ON messages(status, received_at DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_messages_received
+    ON messages(received_at DESC, id DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_messages_envelope_rcpt_lower
+    ON messages(LOWER(envelope_rcpt))
+    """,
+]
+
+
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+SETTINGS_CACHE_TTL_SECONDS = 5.0
+# Negative cache_size is in KiB; pooled read connections live for the whole process,
+# so a larger page cache keeps hot index pages resident between requests.
+READ_CACHE_SIZE_KIB = 20 * 1024
+
 
 def get_connection(db_path: Path) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL makes NORMAL durable across application crashes, so commits skip the
+    # per-transaction fsync that FULL pays.
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def get_readonly_connection(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA cache_size = -{READ_CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
     conn.row_factory = sqlite3.Row
     return conn
 
 
+_READ_POOL = threading.local()
+
+
+def get_pooled_connection(db_path: Path) -> sqlite3.Connection:
+    # Read-only connections carry no transaction state between statements, so one
+    # per thread and database can be kept open for the life of the process.
+    connections = getattr(_READ_POOL, "connections", None)
+    if connections is None:
+        connections = _READ_POOL.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = connections[db_path] = get_readonly_connection(db_path)
+    return conn
+
+
+def fetch_dicts(
+    conn: sqlite3.Connection, sql: str, params: Iterable[object] = ()
+) -> list[dict[str, object]]:
+    # Plain tuples zipped against one column list skip the intermediate sqlite3.Row
+    # per record that dict(row) would otherwise build and discard.
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, tuple(params))
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
 def init_db(db_path: Path) -> None:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     with get_connection(db_path) as conn:
+        # journal_mode is persistent in the database file, so setting it once here
+        # covers the web app, ingest and purge connections alike.
+        conn.execute("PRAGMA journal_mode = WAL")
         for statement in SCHEMA:
             conn.execute(statement)
         _ensure_message_columns(conn)
         _ensure_admin_action_columns(conn)
         _ensure_domain_policy_columns(conn)
+        for statement in INDEXES:
+            conn.execute(statement)
         conn.commit()
 
 
+def optimize_db(db_path: Path) -> None:
+    # PRAGMA optimize refreshes planner statistics only for tables whose queries
+    # would benefit, so it is cheap enough to run on every shutdown.
+    with get_connection(db_path) as conn:
+        conn.execute("PRAGMA optimize")
+
+
 def _ensure_message_columns(conn: sqlite3.Connection) -> None:
     existing_columns = {
         row["name"] for row in conn.execute("PRAGMA table_info(messages)").fetchall()
@@ -172,10 +252,47 @@ def _ensure_admin_action_columns(conn: sqlite3.Connection) -> None:
         conn.execute("ALTER TABLE admin_actions ADD COLUMN before_state TEXT")
     if "after_state" not in existing_columns:
         conn.execute("ALTER TABLE admin_actions ADD COLUMN after_state TEXT")
+    column_types = {
+        row["name"]: row["type"]
+        for row in conn.execute("PRAGMA table_info(admin_actions)").fetchall()
+    }
+    if column_types.get("performed_at") == "INTEGER":
+        return
+    # Older databases stored ISO timestamps as TEXT, and TEXT affinity would keep
+    # storing epoch values as strings, so rebuild the table with converted values.
+    conn.execute("ALTER TABLE admin_actions RENAME TO admin_actions_legacy")
+    conn.execute(ADMIN_ACTIONS_SCHEMA)
+    conn.execute(
+        """
+        INSERT INTO admin_actions (
+            id, action, actor, entity, before_state, after_state, source_ip, performed_at
+        )
+        SELECT
+            id, action, actor, entity, before_state, after_state, source_ip,
+            COALESCE(CAST(strftime('%s', performed_at) AS INTEGER), 0)
+        FROM admin_actions_legacy
+        """
+    )
+    conn.execute("DROP TABLE admin_actions_legacy")
+
+
+AdminActionRow = tuple[str, str | None, str | None, str | None, str | None, str, int]
+
+_INSERT_ADMIN_ACTION_SQL = """
+    INSERT INTO admin_actions (
+        action,
+        actor,
+        entity,
+        before_state,
+        after_state,
+        source_ip,
+        performed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 def get_setting(db_path: Path, key: str) -> str | None:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
         return row["value"] if row else None
 
@@ -188,6 +305,71 @@ def set_setting(db_path: Path, key: str, value: str) -> None:
             (key, value),
         )
         conn.commit()
+    _invalidate_settings_snapshot(db_path)
+
+
+def set_settings(
+    db_path: Path, values: dict[str, str], admin_actions: Iterable[AdminActionRow] = ()
+) -> None:
+    # Audit rows describing the change commit in the same transaction as the settings.
+    actions = list(admin_actions)
+    if not values and not actions:
+        return
+    with get_connection(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO settings (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            values.items(),
+        )
+        if actions:
+            conn.executemany(_INSERT_ADMIN_ACTION_SQL, actions)
+        conn.commit()
+    _invalidate_settings_snapshot(db_path)
+
+
+_SETTINGS_LOCK = threading.Lock()
+_SETTINGS_SNAPSHOTS: dict[Path, tuple[float, dict[str, str]]] = {}
+_SETTINGS_VERSION = 0
+
+
+def get_cached_setting(db_path: Path, key: str) -> str | None:
+    return _get_settings_snapshot(db_path).get(key)
+
+
+def get_cached_settings(db_path: Path, keys: Iterable[str]) -> dict[str, str | None]:
+    snapshot = _get_settings_snapshot(db_path)
+    return {key: snapshot.get(key) for key in keys}
+
+
+def _get_settings_snapshot(db_path: Path) -> dict[str, str]:
+    # Writes through set_setting drop the snapshot straight away. The TTL bounds how
+    # long a write from another process (ingest, purge) can go unnoticed here.
+    cached = _SETTINGS_SNAPSHOTS.get(db_path)
+    if cached is not None and time.monotonic() - cached[0] < SETTINGS_CACHE_TTL_SECONDS:
+        return cached[1]
+    return _load_settings_snapshot(db_path)
+
+
+def _load_settings_snapshot(db_path: Path) -> dict[str, str]:
+    version = _SETTINGS_VERSION
+    loaded_at = time.monotonic()
+    with get_pooled_connection(db_path) as conn:
+        snapshot = {
+            row["key"]: row["value"]
+            for row in conn.execute("SELECT key, value FROM settings").fetchall()
+        }
+    with _SETTINGS_LOCK:
+        # A write that landed while we were reading makes this snapshot stale.
+        if version == _SETTINGS_VERSION:
+            _SETTINGS_SNAPSHOTS[db_path] = (loaded_at, snapshot)
+    return snapshot
+
+
+def _invalidate_settings_snapshot(db_path: Path) -> None:
+    global _SETTINGS_VERSION
+    with _SETTINGS_LOCK:
+        _SETTINGS_VERSION += 1
+        _SETTINGS_SNAPSHOTS.pop(db_path, None)
 
 
 def iter_settings(db_path: Path) -> Iterable[sqlite3.Row]:
@@ -199,7 +381,7 @@ def log_admin_action(
     db_path: Path,
     action: str,
     source_ip: str,
-    performed_at: str,
+    performed_at: int,
     actor: str | None = None,
     entity: str | None = None,
     before_state: str | None = None,
@@ -207,17 +389,7 @@ def log_admin_action(
 ) -> None:
     with get_connection(db_path) as conn:
         conn.execute(
-            """
-            INSERT INTO admin_actions (
-                action,
-                actor,
-                entity,
-                before_state,
-                after_state,
-                source_ip,
-                performed_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_ADMIN_ACTION_SQL,
             (
                 action,
                 actor,
@@ -231,6 +403,12 @@ def log_admin_action(
         conn.commit()
 
 
+def log_admin_actions(db_path: Path, rows: Iterable[AdminActionRow]) -> None:
+    with get_connection(db_path) as conn:
+        conn.executemany(_INSERT_ADMIN_ACTION_SQL, rows)
+        conn.commit()
+
+
 def log_ingest_decision(
     db_path: Path,
     message_id: int,
@@ -289,7 +467,7 @@ def log_ingest_attempt(
 
 
 def list_ingest_attempts(db_path: Path, limit: int = 20) -> Iterable[sqlite3.Row]:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         yield from conn.execute(
             """
             SELECT occurred_at, envelope_rcpt, status, error_summary
@@ -298,7 +476,7 @@ def list_ingest_attempts(db_path: Path, limit: int = 20) -> Iterable[sqlite3.Row
             LIMIT ?
             """,
             (limit,),
-        )
+        ).fetchall()
 
 
 def log_inbox_event(
@@ -326,7 +504,7 @@ def log_inbox_event(
 
 
 def list_inbox_events(db_path: Path, since_id: int, limit: int = 100) -> Iterable[sqlite3.Row]:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         yield from conn.execute(
             """
             SELECT id, event_type, message_id, envelope_rcpt, quarantined
@@ -336,43 +514,17 @@ def list_inbox_events(db_path: Path, since_id: int, limit: int = 100) -> Iterabl
             LIMIT ?
             """,
             (since_id, limit),
-        )
+        ).fetchall()
 
 
 def get_last_inbox_event_id(db_path: Path) -> int:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         row = conn.execute("SELECT COALESCE(MAX(id), 0) AS last_id FROM inbox_events").fetchone()
         return int(row["last_id"] or 0)
 
 
-def get_rate_limit_state(db_path: Path, source_ip: str) -> sqlite3.Row | None:
-    with get_connection(db_path) as conn:
-        return conn.execute(
-            "SELECT source_ip, attempts, window_start FROM admin_rate_limits WHERE source_ip = ?",
-            (source_ip,),
-        ).fetchone()
-
-
-def set_rate_limit_state(db_path: Path, source_ip: str, attempts: int, window_start: str) -> None:
-    with get_connection(db_path) as conn:
-        conn.execute(
-            "INSERT INTO admin_rate_limits (source_ip, attempts, window_start) "
-            "VALUES (?, ?, ?) "
-            "ON CONFLICT(source_ip) DO UPDATE SET "
-            "attempts = excluded.attempts, window_start = excluded.window_start",
-            (source_ip, attempts, window_start),
-        )
-        conn.commit()
-
-
-def clear_rate_limit_state(db_path: Path, source_ip: str) -> None:
-    with get_connection(db_path) as conn:
-        conn.execute("DELETE FROM admin_rate_limits WHERE source_ip = ?", (source_ip,))
-        conn.commit()
-
-
 def list_domain_policies(db_path: Path) -> list[sqlite3.Row]:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         rows = conn.execute("""
             SELECT
                 domain,
@@ -388,7 +540,7 @@ def list_domain_policies(db_path: Path) -> list[sqlite3.Row]:
 
 
 def get_domain_policy(db_path: Path, domain: str) -> sqlite3.Row | None:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         return conn.execute(
             """
             SELECT
@@ -454,7 +606,7 @@ def upsert_domain_policy(
 
 
 def list_address_rules(db_path: Path, domain: str) -> list[sqlite3.Row]:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         rows = conn.execute(
             """
             SELECT
@@ -479,7 +631,7 @@ def list_address_rules(db_path: Path, domain: str) -> list[sqlite3.Row]:
 
 
 def get_domain_quarantine_retention_overrides(db_path: Path) -> dict[str, int]:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         rows = conn.execute("""
             SELECT domain, quarantine_retention_days
             FROM domain_policy
@@ -496,6 +648,9 @@ def get_domain_quarantine_retention_overrides(db_path: Path) -> dict[str, int]:
     return overrides
 
 
+AddressRuleRow = tuple[str, str, str, str, int, str, int, str | None]
+
+
 def create_address_rule(
     db_path: Path,
     domain: str,
@@ -508,38 +663,43 @@ def create_address_rule(
     note: str | None,
     now: str,
 ) -> sqlite3.Row:
+    rows = create_address_rules(
+        db_path, [(domain, rule_type, match_field, pattern, priority, action, enabled, note)], now
+    )
+    if not rows:
+        raise RuntimeError("Failed to create address rule.")
+    return rows[0]
+
+
+def create_address_rules(
+    db_path: Path, rules: Iterable[AddressRuleRow], now: str
+) -> list[sqlite3.Row]:
     with get_connection(db_path) as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO address_rule (
-                domain,
-                rule_type,
-                match_field,
-                pattern,
-                priority,
-                action,
-                enabled,
-                note,
-                created_at,
-                updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                domain,
-                rule_type,
-                match_field,
-                pattern,
-                priority,
-                action,
-                enabled,
-                note,
-                now,
-                now,
-            ),
-        )
-        rule_id = cursor.lastrowid
-        row = conn.execute(
-            """
+        rule_ids = [
+            conn.execute(
+                """
+                INSERT INTO address_rule (
+                    domain,
+                    rule_type,
+                    match_field,
+                    pattern,
+                    priority,
+                    action,
+                    enabled,
+                    note,
+                    created_at,
+                    updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (*rule, now, now),
+            ).lastrowid
+            for rule in rules
+        ]
+        if not rule_ids:
+            return []
+        placeholders = ", ".join("?" for _ in rule_ids)
+        rows = conn.execute(
+            f"""
             SELECT
                 id,
                 domain,
@@ -553,18 +713,17 @@ def create_address_rule(
                 created_at,
                 updated_at
             FROM address_rule
-            WHERE id = ?
+            WHERE id IN ({placeholders})
+            ORDER BY id
             """,
-            (rule_id,),
-        ).fetchone()
+            rule_ids,
+        ).fetchall()
         conn.commit()
-    if not row:
-        raise RuntimeError("Failed to create address rule.")
-    return row
+    return rows
 
 
 def get_address_rule(db_path: Path, rule_id: int) -> sqlite3.Row | None:
-    with get_connection(db_path) as conn:
+    with get_pooled_connection(db_path) as conn:
         return conn.execute(
             """
             SELECT
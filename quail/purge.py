@@ -203,7 +203,7 @@ def _purge_messages(
 def _purge_admin_actions(conn: sqlite3.Connection, cutoff: datetime) -> int:
     cursor = conn.execute(
         "DELETE FROM admin_actions WHERE performed_at < ?",
-        (cutoff.isoformat(),),
+        (int(cutoff.timestamp()),),
     )
     conn.commit()
     return cursor.rowcount
@@ -0,0 +1,69 @@
+"""In-process sliding-window rate limiting for Quail."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+
+class SlidingWindowLimiter:
+    """Track recent failures per key and refuse once a window fills up.
+
+    State lives in this process only, which matches the single uvicorn worker
+    Quail runs under. Keys whose window drains are dropped when next touched, and
+    a sweep of every key runs whenever the table doubles in size, so clients that
+    never return do not accumulate either.
+    """
+
+    MIN_SWEEP_THRESHOLD = 1024
+
+    def __init__(self, max_attempts: int, window_seconds: float) -> None:
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self._failures: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+        self._sweep_threshold = self.MIN_SWEEP_THRESHOLD
+
+    def is_limited(self, key: str, now: float) -> bool:
+        with self._lock:
+            failures = self._prune(key, now)
+            return failures is not None and len(failures) >= self.max_attempts
+
+    def record_failure(self, key: str, now: float) -> None:
+        with self._lock:
+            failures = self._prune(key, now)
+            if failures is None:
+                failures = self._failures[key] = deque()
+                if len(self._failures) >= self._sweep_threshold:
+                    self._sweep(now)
+            failures.append(now)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._sweep_threshold = self.MIN_SWEEP_THRESHOLD
+
+    def _sweep(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        expired = [
+            key for key, failures in self._failures.items() if failures and failures[-1] <= cutoff
+        ]
+        for key in expired:
+            del self._failures[key]
+        self._sweep_threshold = max(self.MIN_SWEEP_THRESHOLD, 2 * len(self._failures))
+
+    def _prune(self, key: str, now: float) -> deque[float] | None:
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        cutoff = now - self.window_seconds
+        while failures and failures[0] <= cutoff:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
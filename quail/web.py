@@ -5,17 +5,24 @@ from __future__ import annotations
 import asyncio
 import json
 import hashlib
+import hmac
 import logging
 import os
+import queue
 import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from email import policy
 from email.parser import BytesParser
 from email.utils import getaddresses
+from functools import lru_cache
 from pathlib import Path
 import secrets
-from typing import Iterable
+import sqlite3
+import time
+from typing import AsyncIterator, Callable, Iterable
 from urllib.parse import quote
 
 import bleach
@@ -27,9 +34,11 @@ except ImportError:  # pragma: no cover - depends on optional dependency
     CSSSanitizer = None
 from argon2.exceptions import InvalidHash, VerifyMismatchError
 from fastapi import FastAPI, Form, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from markupsafe import escape
 from starlette.status import HTTP_303_SEE_OTHER
 
 from quail import db
@@ -42,6 +51,7 @@ from quail.ingest import (
     SETTINGS_ALLOWED_MIME_KEY,
 )
 from quail.logging_config import configure_logging
+from quail.ratelimit import SlidingWindowLimiter
 from quail.security import hash_pin, verify_pin
 from quail.settings import get_settings
 
@@ -59,14 +69,22 @@ DEFAULT_ALLOW_RICH_HTML = "false"
 DEFAULT_ALLOW_FULL_HTML = "false"
 ADMIN_SESSION_COOKIE = "quail_admin_session"
 ADMIN_SESSION_TTL = timedelta(minutes=20)
-ADMIN_RATE_LIMIT_WINDOW = timedelta(minutes=15)
+ADMIN_RATE_LIMIT_WINDOW_SECONDS = 15 * 60
 ADMIN_RATE_LIMIT_MAX_ATTEMPTS = 5
 ADMIN_PIN_MAX_LEN = 9
 ADMIN_PIN_MIN_LEN = 4
+ADMIN_PIN_VERIFY_CACHE_SECONDS = 30.0
 MAX_LIST_ROWS = 200
+MAX_BATCH_MESSAGE_IDS = 500
 INBOX_PAGE_SIZE = 20
+FILE_DELETE_WORKERS = 8
+FILE_DELETE_INLINE_MAX = 8
 INBOX_MAX_PAGE_SIZE = MAX_LIST_ROWS
 CSRF_COOKIE = "quail_csrf"
+UNLOCK_PAGE_ERRORS = frozenset({"invalid", "rate_limited", "pin_length", "pin_format"})
+ADMIN_LOG_FLUSH_INTERVAL_SECONDS = 1.0
+ADMIN_LOG_BATCH_SIZE = 100
+MESSAGE_BODY_CACHE_SIZE = 64
 
 BASE_DIR = Path(__file__).parent
 TEMPLATES_DIR = BASE_DIR / "templates"
@@ -74,16 +92,69 @@ STATIC_DIR = BASE_DIR / "static"
 STATIC_CSS_PATH = STATIC_DIR / "quail.css"
 ENABLE_WS = os.getenv("QUAIL_ENABLE_WS", "true").strip().lower() in {"1", "true", "yes", "on"}
 RAW_ALLOWED_ORIGINS = os.getenv("QUAIL_ALLOWED_ORIGINS", "")
+SESSION_HMAC_KEY = os.getenv("QUAIL_SESSION_KEY", "").encode("utf-8") or secrets.token_bytes(32)
+JINJA_CACHE_DIR = os.getenv("QUAIL_JINJA_CACHE_DIR", "").strip()
+TEMPLATE_AUTO_RELOAD = os.getenv("QUAIL_TEMPLATE_AUTO_RELOAD", "false").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    await _startup()
+    try:
+        yield
+    finally:
+        await _shutdown()
+
 
-app = FastAPI(title="Quail")
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+app = FastAPI(title="Quail", default_response_class=ORJSONResponse, lifespan=_lifespan)
+# Templates ship with the package, so skip the per-render stat() unless a developer
+# opts back in while editing them.
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=True,
+        auto_reload=TEMPLATE_AUTO_RELOAD,
+    )
+)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 templates.env.globals["static_version"] = (
     str(int(STATIC_CSS_PATH.stat().st_mtime)) if STATIC_CSS_PATH.exists() else "dev"
 )
 LOGGER = logging.getLogger(__name__)
+try:
+    if JINJA_CACHE_DIR:
+        Path(JINJA_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    templates.env.bytecode_cache = FileSystemBytecodeCache(directory=JINJA_CACHE_DIR or None)
+except (OSError, RuntimeError):  # pragma: no cover - depends on a writable cache directory
+    LOGGER.warning("Jinja bytecode cache unavailable; templates will compile per process.")
+# Page templates are resolved once so each render skips the environment's name lookup.
+_PAGE_TEMPLATES = {
+    name: templates.get_template(name)
+    for name in (
+        "admin_quarantine.html",
+        "admin_settings.html",
+        "admin_unlock.html",
+        "inbox.html",
+        "message.html",
+    )
+}
+_MESSAGE_PARSER = BytesParser(policy=policy.default)
+_CSRF_TOKEN_PLACEHOLDER = "__quail_csrf_token__"
+_UNLOCK_PAGE_CACHE: dict[tuple[str | None, bool], str] = {}
+# Keyed by the stored PIN hash, so changing the PIN never matches an old entry.
+_VERIFIED_ADMIN_PIN: dict[str, tuple[bytes, float]] = {}
+ADMIN_RATE_LIMITER = SlidingWindowLimiter(
+    ADMIN_RATE_LIMIT_MAX_ATTEMPTS, ADMIN_RATE_LIMIT_WINDOW_SECONDS
+)
 INBOX_HUB = None
 WS_EVENT_TASK: asyncio.Task | None = None
+ADMIN_LOG_QUEUE: queue.SimpleQueue[tuple[Path, db.AdminActionRow]] = queue.SimpleQueue()
+ADMIN_LOG_TASK: asyncio.Task | None = None
 
 
 class InboxHub:
@@ -100,7 +171,17 @@ class InboxHub:
         self, ws: WebSocket, inbox_filter: str, is_admin: bool, limit: int
     ) -> None:
         async with self.lock:
-            self.connections.get((inbox_filter, is_admin, limit), set()).discard(ws)
+            self._discard((inbox_filter, is_admin, limit), [ws])
+
+    def _discard(self, key: tuple[str, bool, int], sockets: Iterable[WebSocket]) -> None:
+        # Drop keys once their last socket leaves so the map stays bounded by live
+        # connections and broadcasts do not build snapshots for nobody.
+        connections = self.connections.get(key)
+        if connections is None:
+            return
+        connections.difference_update(sockets)
+        if not connections:
+            del self.connections[key]
 
     async def broadcast(
         self, inbox_filter: str, is_admin: bool, limit: int, payload: dict[str, object]
@@ -117,8 +198,7 @@ class InboxHub:
                 stale.append(ws)
         if stale:
             async with self.lock:
-                for ws in stale:
-                    self.connections.get((inbox_filter, is_admin, limit), set()).discard(ws)
+                self._discard((inbox_filter, is_admin, limit), stale)
 
 
 def _now() -> datetime:
@@ -128,7 +208,7 @@ def _now() -> datetime:
 def _get_client_ip(request: Request) -> str:
     forwarded_for = request.headers.get("x-forwarded-for")
     if forwarded_for:
-        return forwarded_for.split(",", maxsplit=1)[0].strip()
+        return forwarded_for.partition(",")[0].strip()
     if request.client:
         return request.client.host
     return "unknown"
@@ -169,56 +249,79 @@ def _secure_cookie_required(request: Request) -> bool:
     return False
 
 
-def _secure_cookie_required(request: Request) -> bool:
-    if request.url.scheme == "https":
-        return True
-    forwarded_proto = request.headers.get("x-forwarded-proto", "")
-    if forwarded_proto:
-        return forwarded_proto.split(",", maxsplit=1)[0].strip().lower() == "https"
-    return False
+def _init_settings(settings_path: Path) -> None:
+    defaults = {
+        SETTINGS_ALLOWED_MIME_KEY: DEFAULT_ALLOWED_MIME_TYPES_VALUE,
+        RETENTION_DAYS_KEY: DEFAULT_RETENTION_DAYS,
+        QUARANTINE_RETENTION_DAYS_KEY: DEFAULT_QUARANTINE_RETENTION_DAYS,
+        ALLOW_HTML_KEY: DEFAULT_ALLOW_HTML,
+        ALLOW_RICH_HTML_KEY: DEFAULT_ALLOW_RICH_HTML,
+        ALLOW_FULL_HTML_KEY: DEFAULT_ALLOW_FULL_HTML,
+    }
+    current = db.get_cached_settings(settings_path, defaults)
+    db.set_settings(
+        settings_path, {key: value for key, value in defaults.items() if current[key] is None}
+    )
 
 
-def _init_settings(settings_path: Path) -> None:
-    if db.get_setting(settings_path, SETTINGS_ALLOWED_MIME_KEY) is None:
-        db.set_setting(settings_path, SETTINGS_ALLOWED_MIME_KEY, DEFAULT_ALLOWED_MIME_TYPES_VALUE)
-    if db.get_setting(settings_path, RETENTION_DAYS_KEY) is None:
-        db.set_setting(settings_path, RETENTION_DAYS_KEY, DEFAULT_RETENTION_DAYS)
-    if db.get_setting(settings_path, QUARANTINE_RETENTION_DAYS_KEY) is None:
-        db.set_setting(
-            settings_path, QUARANTINE_RETENTION_DAYS_KEY, DEFAULT_QUARANTINE_RETENTION_DAYS
-        )
-    if db.get_setting(settings_path, ALLOW_HTML_KEY) is None:
-        db.set_setting(settings_path, ALLOW_HTML_KEY, DEFAULT_ALLOW_HTML)
-    if db.get_setting(settings_path, ALLOW_RICH_HTML_KEY) is None:
-        db.set_setting(settings_path, ALLOW_RICH_HTML_KEY, DEFAULT_ALLOW_RICH_HTML)
-    if db.get_setting(settings_path, ALLOW_FULL_HTML_KEY) is None:
-        db.set_setting(settings_path, ALLOW_FULL_HTML_KEY, DEFAULT_ALLOW_FULL_HTML)
+def _get_general_settings(settings_db_path: Path) -> dict[str, object]:
+    values = db.get_cached_settings(
+        settings_db_path,
+        (
+            SETTINGS_ALLOWED_MIME_KEY,
+            RETENTION_DAYS_KEY,
+            QUARANTINE_RETENTION_DAYS_KEY,
+            ALLOW_HTML_KEY,
+        ),
+    )
+    return {
+        "allowed_mime_types": values[SETTINGS_ALLOWED_MIME_KEY]
+        or DEFAULT_ALLOWED_MIME_TYPES_VALUE,
+        "retention_days": values[RETENTION_DAYS_KEY] or DEFAULT_RETENTION_DAYS,
+        "quarantine_retention_days": values[QUARANTINE_RETENTION_DAYS_KEY]
+        or DEFAULT_QUARANTINE_RETENTION_DAYS,
+        "allow_html": values[ALLOW_HTML_KEY] == "true",
+    }
 
 
 def _get_admin_pin_hash(settings_db_path: Path) -> str | None:
-    return db.get_setting(settings_db_path, ADMIN_PIN_HASH_KEY)
+    return db.get_cached_setting(settings_db_path, ADMIN_PIN_HASH_KEY)
 
 
-def _get_session_state(settings_db_path: Path) -> tuple[str | None, datetime | None]:
-    token_hash = db.get_setting(settings_db_path, "admin_session_hash")
-    expires_at_raw = db.get_setting(settings_db_path, "admin_session_expires_at")
+def _get_session_state(settings_db_path: Path) -> tuple[str | None, int | None]:
+    state = db.get_cached_settings(
+        settings_db_path, ("admin_session_hash", "admin_session_expires_at")
+    )
+    token_hash = state["admin_session_hash"]
+    expires_at_raw = state["admin_session_expires_at"]
     if not token_hash or not expires_at_raw:
         return None, None
     try:
-        expires_at = datetime.fromisoformat(expires_at_raw)
+        expires_at = int(expires_at_raw)
     except ValueError:
+        # Sessions written before expiry moved to epoch seconds stored ISO strings.
         return None, None
     return token_hash, expires_at
 
 
-def _set_session_state(settings_db_path: Path, token_hash: str, expires_at: datetime) -> None:
-    db.set_setting(settings_db_path, "admin_session_hash", token_hash)
-    db.set_setting(settings_db_path, "admin_session_expires_at", expires_at.isoformat())
+def _set_session_state(
+    settings_db_path: Path,
+    token_hash: str,
+    expires_at: datetime,
+    admin_actions: Iterable[db.AdminActionRow] = (),
+) -> None:
+    db.set_settings(
+        settings_db_path,
+        {
+            "admin_session_hash": token_hash,
+            "admin_session_expires_at": str(int(expires_at.timestamp())),
+        },
+        admin_actions,
+    )
 
 
 def _clear_session_state(settings_db_path: Path) -> None:
-    db.set_setting(settings_db_path, "admin_session_hash", "")
-    db.set_setting(settings_db_path, "admin_session_expires_at", "")
+    db.set_settings(settings_db_path, {"admin_session_hash": "", "admin_session_expires_at": ""})
 
 
 def _get_or_create_csrf_token(request: Request) -> str:
@@ -239,48 +342,39 @@ def _set_csrf_cookie(response: Response, request: Request, token: str) -> None:
     )
 
 
-def _require_csrf(request: Request, token: str | None) -> None:
-    cookie_token = request.cookies.get(CSRF_COOKIE)
-    header_token = request.headers.get("x-csrf-token")
-    supplied = token or header_token
-    if not cookie_token or not supplied or supplied != cookie_token:
-        raise HTTPException(status_code=403, detail="Invalid or missing CSRF token.")
+def _get_page_template(name: str) -> Template:
+    if TEMPLATE_AUTO_RELOAD:
+        return templates.get_template(name)
+    return _PAGE_TEMPLATES[name]
 
 
-def _is_rate_limited(settings_db_path: Path, source_ip: str, now: datetime) -> bool:
-    state = db.get_rate_limit_state(settings_db_path, source_ip)
-    if not state:
-        return False
-    try:
-        window_start = datetime.fromisoformat(state["window_start"])
-    except ValueError:
-        db.clear_rate_limit_state(settings_db_path, source_ip)
-        return False
-    if now - window_start > ADMIN_RATE_LIMIT_WINDOW:
-        db.clear_rate_limit_state(settings_db_path, source_ip)
-        return False
-    return state["attempts"] >= ADMIN_RATE_LIMIT_MAX_ATTEMPTS
+def _render_page(
+    name: str, context: dict[str, object], headers: dict[str, str] | None = None
+) -> HTMLResponse:
+    return HTMLResponse(_get_page_template(name).render(context), headers=headers)
 
 
-def _record_rate_limit_failure(settings_db_path: Path, source_ip: str, now: datetime) -> None:
-    state = db.get_rate_limit_state(settings_db_path, source_ip)
-    if not state:
-        db.set_rate_limit_state(settings_db_path, source_ip, 1, now.isoformat())
-        return
-    try:
-        window_start = datetime.fromisoformat(state["window_start"])
-    except ValueError:
-        db.set_rate_limit_state(settings_db_path, source_ip, 1, now.isoformat())
-        return
-    if now - window_start > ADMIN_RATE_LIMIT_WINDOW:
-        db.set_rate_limit_state(settings_db_path, source_ip, 1, now.isoformat())
-        return
-    attempts = state["attempts"] + 1
-    db.set_rate_limit_state(settings_db_path, source_ip, attempts, window_start.isoformat())
+def _render_unlock_page(error: str | None, pin_configured: bool, csrf_token: str) -> str:
+    # The unlock page only varies by error code, PIN state and CSRF token, so each
+    # variant is rendered once with a placeholder that the live token replaces.
+    key = (error if error in UNLOCK_PAGE_ERRORS else None, pin_configured)
+    page = _UNLOCK_PAGE_CACHE.get(key)
+    if page is None:
+        page = _get_page_template("admin_unlock.html").render(
+            error=key[0], pin_configured=pin_configured, csrf_token=_CSRF_TOKEN_PLACEHOLDER
+        )
+        _UNLOCK_PAGE_CACHE[key] = page
+    return page.replace(_CSRF_TOKEN_PLACEHOLDER, str(escape(csrf_token)))
 
 
-def _reset_rate_limit(settings_db_path: Path, source_ip: str) -> None:
-    db.clear_rate_limit_state(settings_db_path, source_ip)
+def _require_csrf(request: Request, token: str | None) -> None:
+    cookie_token = request.cookies.get(CSRF_COOKIE)
+    header_token = request.headers.get("x-csrf-token")
+    supplied = token or header_token
+    if not cookie_token or not supplied:
+        raise HTTPException(status_code=403, detail="Invalid or missing CSRF token.")
+    if not secrets.compare_digest(supplied.encode("utf-8"), cookie_token.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid or missing CSRF token.")
 
 
 def _is_admin_token(token: str | None) -> bool:
@@ -290,17 +384,26 @@ def _is_admin_token(token: str | None) -> bool:
     token_hash, expires_at = _get_session_state(settings.db_path)
     if not token_hash or not expires_at:
         return False
-    if expires_at < _now():
+    if expires_at < time.time():
         _clear_session_state(settings.db_path)
         return False
-    try:
-        return verify_pin(token, token_hash)
-    except Exception:
-        return False
+    return hmac.compare_digest(_session_token_digest(token), token_hash)
+
+
+def _session_token_digest(token: str) -> str:
+    # Session tokens are 256-bit random values, so a keyed hash is enough; Argon2 is
+    # reserved for the low-entropy PIN.
+    return hmac.new(SESSION_HMAC_KEY, token.encode("utf-8"), hashlib.sha256).hexdigest()
 
 
 def _is_admin(request: Request) -> bool:
-    return _is_admin_token(request.cookies.get(ADMIN_SESSION_COOKIE))
+    # request.state is per request, so helpers that re-check the session within one
+    # handler reuse the first answer.
+    is_admin = getattr(request.state, "is_admin", None)
+    if is_admin is None:
+        is_admin = _is_admin_token(request.cookies.get(ADMIN_SESSION_COOKIE))
+        request.state.is_admin = is_admin
+    return is_admin
 
 
 def _serialize_admin_snapshot(value: object | None) -> str | None:
@@ -311,6 +414,26 @@ def _serialize_admin_snapshot(value: object | None) -> str | None:
     return json.dumps(value, default=str, sort_keys=True)
 
 
+def _admin_action_row(
+    action: str,
+    request: Request,
+    *,
+    actor: str | None = "admin",
+    entity: str | None = None,
+    before_state: object | None = None,
+    after_state: object | None = None,
+) -> db.AdminActionRow:
+    return (
+        action,
+        actor,
+        entity,
+        _serialize_admin_snapshot(before_state),
+        _serialize_admin_snapshot(after_state),
+        _get_client_ip(request),
+        int(time.time()),
+    )
+
+
 def _log_admin_action(
     db_path: Path,
     action: str,
@@ -320,22 +443,79 @@ def _log_admin_action(
     entity: str | None = None,
     before_state: object | None = None,
     after_state: object | None = None,
+    defer: bool = False,
 ) -> None:
-    db.log_admin_action(
-        db_path,
+    row = _admin_action_row(
         action,
-        _get_client_ip(request),
-        _now().isoformat(),
+        request,
         actor=actor,
         entity=entity,
-        before_state=_serialize_admin_snapshot(before_state),
-        after_state=_serialize_admin_snapshot(after_state),
+        before_state=before_state,
+        after_state=after_state,
     )
+    if defer and ADMIN_LOG_TASK is not None:
+        ADMIN_LOG_QUEUE.put_nowait((db_path, row))
+        return
+    db.log_admin_actions(db_path, [row])
+
+
+def _drain_admin_log_queue() -> list[tuple[Path, db.AdminActionRow]]:
+    entries = []
+    while True:
+        try:
+            entries.append(ADMIN_LOG_QUEUE.get_nowait())
+        except queue.Empty:
+            return entries
+
+
+def _requeue_admin_log_rows(pending: dict[Path, list[db.AdminActionRow]]) -> None:
+    # Unwritten rows go back ahead of anything queued while the write was failing,
+    # so the next flush keeps the original order.
+    newer = _drain_admin_log_queue()
+    for db_path, rows in pending.items():
+        for row in rows:
+            ADMIN_LOG_QUEUE.put_nowait((db_path, row))
+    for entry in newer:
+        ADMIN_LOG_QUEUE.put_nowait(entry)
+
+
+def _flush_admin_log_queue() -> int:
+    pending: dict[Path, list[db.AdminActionRow]] = {}
+    for db_path, row in _drain_admin_log_queue():
+        pending.setdefault(db_path, []).append(row)
+    flushed = 0
+    for db_path in list(pending):
+        rows = pending[db_path]
+        while rows:
+            batch = rows[:ADMIN_LOG_BATCH_SIZE]
+            try:
+                db.log_admin_actions(db_path, batch)
+            except Exception:
+                _requeue_admin_log_rows(pending)
+                raise
+            del rows[: len(batch)]
+            flushed += len(batch)
+        del pending[db_path]
+    return flushed
+
+
+async def _admin_log_loop() -> None:
+    while True:
+        try:
+            await asyncio.sleep(ADMIN_LOG_FLUSH_INTERVAL_SECONDS)
+            await asyncio.to_thread(_flush_admin_log_queue)
+        except asyncio.CancelledError:
+            return
+        except Exception:
+            LOGGER.exception("Admin audit log flush failed; retrying.")
+
+
+_MIME_SPLIT_RE = re.compile(r"\s*,\s*")
 
 
 def _normalize_mime_list(value: str) -> str:
-    items = [item.strip().lower() for item in value.split(",") if item.strip()]
-    return ",".join(items)
+    items = _MIME_SPLIT_RE.split(value.strip().lower())
+    return ",".join(dict.fromkeys(item for item in items if item))
 
 
 def _parse_enabled(raw_value: str | None) -> int:
@@ -347,26 +527,34 @@ def _parse_enabled(raw_value: str | None) -> int:
     return 0
 
 
+@lru_cache(maxsize=256)
+def _compile_regex(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern)
+
+
 def _validate_regex(pattern: str) -> str | None:
     try:
-        re.compile(pattern)
+        _compile_regex(pattern)
     except re.error as exc:
         return f"Invalid regex pattern: {exc}"
     return None
 
 
+_DOMAIN_INVALID_RE = re.compile(r"[\s@]")
+
+
 def _normalize_domain(value: str | None) -> str | None:
     if not value:
         return None
     normalized = value.strip().lower()
-    if not normalized or "@" in normalized or any(char.isspace() for char in normalized):
+    if not normalized or _DOMAIN_INVALID_RE.search(normalized):
         return None
     return normalized or None
 
 
 def _rule_error_response(
     request: Request, domain: str | None, message: str
-) -> RedirectResponse | JSONResponse:
+) -> RedirectResponse | ORJSONResponse:
     if _wants_json(request):
         raise HTTPException(status_code=400, detail=message)
     domain_param = f"rules_domain={quote(domain)}&" if domain else ""
@@ -404,7 +592,7 @@ def _normalize_rule_fields(
     priority: str,
     action: str,
     domain: str | None = None,
-) -> tuple[dict[str, object] | None, RedirectResponse | JSONResponse | None]:
+) -> tuple[dict[str, object] | None, RedirectResponse | ORJSONResponse | None]:
     normalized_domain = _normalize_domain(domain) if domain is not None else None
     if domain is not None and not normalized_domain:
         message = "Domain is required."
@@ -474,16 +662,12 @@ def _build_quarantine_query(
     return f"?{'&'.join(params)}" if params else ""
 
 
-async def _extract_message_ids(request: Request) -> list[int]:
-    form = await request.form()
-    raw_values = form.getlist("message_id")
-    message_ids = []
-    for value in raw_values:
-        try:
-            message_ids.append(int(value))
-        except ValueError:
-            continue
-    return message_ids
+def _parse_message_ids(raw_values: list[str]) -> list[int]:
+    if len(raw_values) > MAX_BATCH_MESSAGE_IDS:
+        raise HTTPException(status_code=400, detail="Too many messages selected.")
+    # Message ids are positive integers, so anything that is not all decimal digits
+    # is skipped without raising and catching a ValueError per value.
+    return [int(value) for value in raw_values if value.isdecimal()]
 
 
 def _require_admin_session(request: Request) -> RedirectResponse | None:
@@ -504,10 +688,23 @@ def _verify_admin_pin(db_path: Path, admin_pin: str | None) -> bool:
     stored_hash = _get_admin_pin_hash(db_path)
     if not stored_hash:
         return False
+    # Bulk admin actions send the PIN with every request; remember a recent success
+    # so only the first one pays for Argon2. Failures are never cached.
+    pin_digest = hmac.new(SESSION_HMAC_KEY, admin_pin.encode("utf-8"), hashlib.sha256).digest()
+    cached = _VERIFIED_ADMIN_PIN.get(stored_hash)
+    if cached and cached[1] > time.monotonic() and hmac.compare_digest(cached[0], pin_digest):
+        return True
     try:
-        return verify_pin(admin_pin, stored_hash)
+        verified = verify_pin(admin_pin, stored_hash)
     except (VerifyMismatchError, InvalidHash):
         return False
+    if verified:
+        _VERIFIED_ADMIN_PIN.clear()
+        _VERIFIED_ADMIN_PIN[stored_hash] = (
+            pin_digest,
+            time.monotonic() + ADMIN_PIN_VERIFY_CACHE_SECONDS,
+        )
+    return verified
 
 
 def _reject_admin_pin(request: Request) -> RedirectResponse:
@@ -553,15 +750,23 @@ def _matches_inbox_filter(envelope_rcpt: str | None, inbox_filter: str) -> bool:
     cleaned = inbox_filter.strip().lower()
     if "@" in cleaned:
         if "*" in cleaned:
-            pattern = re.escape(cleaned).replace(r"\*", ".*")
-            return re.match(rf"^{pattern}$", envelope) is not None
+            return _inbox_filter_regex(cleaned).match(envelope) is not None
         return envelope == cleaned
     if "*" in cleaned:
-        pattern = re.escape(cleaned).replace(r"\*", ".*")
-        return re.match(rf"^{pattern}@.*$", envelope) is not None
+        return _inbox_filter_regex(cleaned).match(envelope) is not None
     return cleaned in envelope.split("@", maxsplit=1)[0]
 
 
+@lru_cache(maxsize=256)
+def _inbox_filter_regex(cleaned: str) -> re.Pattern[str]:
+    # Live inbox events are matched against every connected client's filter, so the
+    # wildcard pattern is compiled once per filter rather than on each event.
+    pattern = re.escape(cleaned).replace(r"\*", ".*")
+    if "@" in cleaned:
+        return re.compile(rf"^{pattern}$")
+    return re.compile(rf"^{pattern}@.*$")
+
+
 def _normalize_inbox_limit_value(value: int | None, default: int) -> int:
     if value is None or value < 1:
         return default
@@ -662,6 +867,13 @@ def _compute_inbox_etag(
     return f"\"{hashlib.sha256(etag_source.encode('utf-8')).hexdigest()}\""
 
 
+def _compute_inbox_page_etag(snapshot_etag: str) -> str:
+    etag_source = "|".join(
+        (snapshot_etag, str(ENABLE_WS), str(templates.env.globals["static_version"]))
+    )
+    return f'W/"{hashlib.sha1(etag_source.encode("utf-8")).hexdigest()}"'
+
+
 def _build_inbox_snapshot(
     db_path: Path,
     is_admin: bool,
@@ -679,7 +891,7 @@ def _build_inbox_snapshot(
 
 
 def _get_message_summary(db_path: Path, message_id: int) -> dict[str, str] | None:
-    with db.get_connection(db_path) as conn:
+    with db.get_pooled_connection(db_path) as conn:
         row = conn.execute(
             """
             SELECT id, received_at, envelope_rcpt, from_addr, subject, date, size_bytes, quarantined
@@ -786,9 +998,20 @@ async def _broadcast_inbox_event(db_path: Path, event: dict[str, object]) -> Non
         await INBOX_HUB.broadcast(inbox_filter, is_admin, limit, payload)
 
 
+_SIMPLE_ADDRESS = r"[A-Za-z0-9._%+\-=!#$&'*/?^`{|}~]+@[A-Za-z0-9.\-]+"
+_SIMPLE_ADDRESS_RE = re.compile(
+    rf"\s*(?:[^\"<>,;:()@\\\[\]]*<({_SIMPLE_ADDRESS})>|({_SIMPLE_ADDRESS}))\s*"
+)
+
+
 def _extract_primary_address(raw_value: str | None) -> str | None:
     if not raw_value:
         return None
+    # Plain "addr" and "Name <addr>" headers skip the full RFC 2822 parser; anything
+    # with quoting, comments or several addresses still goes through getaddresses.
+    match = _SIMPLE_ADDRESS_RE.fullmatch(raw_value)
+    if match:
+        return match.group(1) or match.group(2)
     addresses = getaddresses([raw_value])
     for _, address in addresses:
         if address:
@@ -829,20 +1052,6 @@ def _iter_quarantine_messages(
     start_date: datetime | None,
     end_date: datetime | None,
 ) -> list[dict[str, str]]:
-    query = """
-        SELECT
-            id,
-            received_at,
-            envelope_rcpt,
-            from_addr,
-            subject,
-            quarantine_reason
-        FROM messages
-        WHERE (status = 'QUARANTINE' OR quarantined = 1)
-        {filters}
-        ORDER BY received_at DESC
-        LIMIT ?
-    """
     conditions = []
     params: list[str | int] = []
     if domain_filter:
@@ -864,58 +1073,83 @@ def _iter_quarantine_messages(
         end_bound = end_date + timedelta(days=1)
         conditions.append("received_at < ?")
         params.append(end_bound.isoformat())
+    with db.get_pooled_connection(db_path) as conn:
+        return db.fetch_dicts(conn, _quarantine_query(tuple(conditions)), params)
+
+
+@lru_cache(maxsize=None)
+def _quarantine_query(conditions: tuple[str, ...]) -> str:
+    # Conditions come from a fixed set of filters, so only a few dozen strings exist.
     filters = f" AND {' AND '.join(conditions)}" if conditions else ""
-    params.append(MAX_LIST_ROWS)
-    with db.get_connection(db_path) as conn:
-        rows = conn.execute(query.format(filters=filters), params).fetchall()
-    return [dict(row) for row in rows]
+    return f"""
+        SELECT
+            id,
+            received_at,
+            envelope_rcpt,
+            from_addr,
+            subject,
+            quarantine_reason
+        FROM messages
+        WHERE (status = 'QUARANTINE' OR quarantined = 1)
+        {filters}
+        ORDER BY received_at DESC
+        LIMIT {MAX_LIST_ROWS}
+    """
 
 
-def _fetch_messages_by_ids(db_path: Path, message_ids: list[int]) -> list[dict[str, str]]:
+def _fetch_messages_by_ids(
+    db_path: Path, message_ids: list[int], quarantined_only: bool = False
+) -> list[dict[str, str]]:
     if not message_ids:
         return []
-    placeholders = ",".join(["?"] * len(message_ids))
-    query = f"""
+    query = _messages_by_ids_query(len(message_ids), quarantined_only)
+    with db.get_pooled_connection(db_path) as conn:
+        return db.fetch_dicts(conn, query, message_ids)
+
+
+@lru_cache(maxsize=32)
+def _messages_by_ids_query(count: int, quarantined_only: bool = False) -> str:
+    placeholders = ",".join(["?"] * count)
+    quarantine_filter = ""
+    if quarantined_only:
+        quarantine_filter = " AND (status = 'QUARANTINE' OR quarantined = 1)"
+    return f"""
         SELECT id, envelope_rcpt, from_addr, subject, status, quarantined
         FROM messages
-        WHERE id IN ({placeholders})
+        WHERE id IN ({placeholders}){quarantine_filter}
     """
-    with db.get_connection(db_path) as conn:
-        rows = conn.execute(query, message_ids).fetchall()
-    return [dict(row) for row in rows]
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 
 def _format_bytes(size_bytes: int) -> str:
-    if size_bytes < 0:
-        size_bytes = 0
-    units = ["B", "KB", "MB", "GB", "TB"]
-    value = float(size_bytes)
-    for unit in units:
-        if value < 1024 or unit == units[-1]:
-            return f"{value:.1f} {unit}" if unit != "B" else f"{int(value)} B"
-        value /= 1024
-    return f"{int(size_bytes)} B"
+    if size_bytes < 1024:
+        return f"{max(int(size_bytes), 0)} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks the unit directly.
+    index = min((int(size_bytes).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * index)):.1f} {_BYTE_UNITS[index]}"
 
 
 def _get_storage_stats(db_path: Path) -> dict[str, int]:
-    with db.get_connection(db_path) as conn:
-        message_row = conn.execute(
-            "SELECT COUNT(*) AS count, COALESCE(SUM(size_bytes), 0) AS total FROM messages"
-        ).fetchone()
-        attachment_row = conn.execute(
-            "SELECT COALESCE(SUM(size_bytes), 0) AS total FROM attachments"
-        ).fetchone()
+    with db.get_pooled_connection(db_path) as conn:
+        row = conn.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM messages) AS message_count,
+                (SELECT COALESCE(SUM(size_bytes), 0) FROM messages) AS message_bytes,
+                (SELECT COALESCE(SUM(size_bytes), 0) FROM attachments) AS attachment_bytes
+            """).fetchone()
     return {
-        "message_count": int(message_row["count"] or 0),
-        "message_bytes": int(message_row["total"] or 0),
-        "attachment_bytes": int(attachment_row["total"] or 0),
+        "message_count": int(row["message_count"] or 0),
+        "message_bytes": int(row["message_bytes"] or 0),
+        "attachment_bytes": int(row["attachment_bytes"] or 0),
     }
 
 
 def _get_ingest_metrics(db_path: Path, now: datetime | None = None) -> dict[str, object]:
     current_time = now or _now()
     cutoff = current_time - timedelta(hours=24)
-    with db.get_connection(db_path) as conn:
+    with db.get_pooled_connection(db_path) as conn:
         inbox_row = conn.execute(
             "SELECT COUNT(*) AS count FROM messages WHERE status = 'INBOX' AND quarantined = 0"
         ).fetchone()
@@ -959,6 +1193,27 @@ def _get_ingest_metrics(db_path: Path, now: datetime | None = None) -> dict[str,
     }
 
 
+@lru_cache(maxsize=None)
+def _inbox_query(include_quarantined: bool, filter_condition: str | None, paginated: bool) -> str:
+    # The handful of possible shapes each map to one stable SQL string, so the
+    # connection's statement cache sees identical text for repeat queries.
+    conditions = []
+    if not include_quarantined:
+        conditions.append("quarantined = 0")
+    if filter_condition:
+        conditions.append(filter_condition)
+    if paginated:
+        conditions.append("(received_at < ? OR (received_at = ? AND id < ?))")
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+        SELECT id, received_at, envelope_rcpt, from_addr, subject, date, size_bytes, quarantined
+        FROM messages
+        {where_clause}
+        ORDER BY received_at DESC, id DESC
+        LIMIT ?
+    """
+
+
 def _iter_messages(
     db_path: Path,
     include_quarantined: bool,
@@ -966,59 +1221,56 @@ def _iter_messages(
     limit: int = MAX_LIST_ROWS,
     before: tuple[str, int] | None = None,
 ) -> Iterable[dict[str, str]]:
-    query = """
-        SELECT id, received_at, envelope_rcpt, from_addr, subject, date, size_bytes, quarantined
-        FROM messages
-        {where_clause}
-        ORDER BY received_at DESC, id DESC
-        LIMIT ?
-    """
-    conditions = []
+    filter_condition = None
     params: list[str | int] = []
-    if not include_quarantined:
-        conditions.append("quarantined = 0")
     if inbox_filter:
-        condition, value = _build_inbox_filter_condition(inbox_filter)
-        conditions.append(condition)
+        filter_condition, value = _build_inbox_filter_condition(inbox_filter)
         params.append(value)
     if before:
         before_received_at, before_id = before
-        conditions.append("(received_at < ? OR (received_at = ? AND id < ?))")
         params.extend([before_received_at, before_received_at, before_id])
-    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
     params.append(limit)
-    with db.get_connection(db_path) as conn:
-        rows = conn.execute(query.format(where_clause=where_clause), params).fetchall()
-    return [dict(row) for row in rows]
+    query = _inbox_query(include_quarantined, filter_condition, before is not None)
+    with db.get_pooled_connection(db_path) as conn:
+        return db.fetch_dicts(conn, query, params)
+
+
+_MESSAGE_SQL = """
+    SELECT id, received_at, envelope_rcpt, from_addr, subject, date, message_id,
+           size_bytes, eml_path, quarantined
+    FROM messages
+    WHERE id = ?
+"""
+_MESSAGE_ATTACHMENTS_SQL = """
+    SELECT id, filename, stored_path, content_type, size_bytes
+    FROM attachments
+    WHERE message_id = ?
+"""
 
 
 def _get_message(db_path: Path, message_id: int) -> dict[str, str]:
-    with db.get_connection(db_path) as conn:
-        row = conn.execute(
-            """
-            SELECT id, received_at, envelope_rcpt, from_addr, subject, date, message_id,
-                   size_bytes, eml_path, quarantined
-            FROM messages
-            WHERE id = ?
-            """,
-            (message_id,),
-        ).fetchone()
+    with db.get_pooled_connection(db_path) as conn:
+        row = conn.execute(_MESSAGE_SQL, (message_id,)).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Message not found.")
     return dict(row)
 
 
 def _get_message_attachments(db_path: Path, message_id: int) -> list[dict[str, str]]:
-    with db.get_connection(db_path) as conn:
-        rows = conn.execute(
-            """
-            SELECT id, filename, stored_path, content_type, size_bytes
-            FROM attachments
-            WHERE message_id = ?
-            """,
-            (message_id,),
-        ).fetchall()
-    return [dict(row) for row in rows]
+    with db.get_pooled_connection(db_path) as conn:
+        return db.fetch_dicts(conn, _MESSAGE_ATTACHMENTS_SQL, (message_id,))
+
+
+def _get_message_detail(
+    db_path: Path, message_id: int
+) -> tuple[dict[str, str], list[dict[str, str]], bool]:
+    with db.get_pooled_connection(db_path) as conn:
+        row = conn.execute(_MESSAGE_SQL, (message_id,)).fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Message not found.")
+        attachments = db.fetch_dicts(conn, _MESSAGE_ATTACHMENTS_SQL, (message_id,))
+    allow_html = db.get_cached_setting(db_path, ALLOW_HTML_KEY) == "true"
+    return dict(row), attachments, allow_html
 
 
 _HTML_BLOCK_RE = re.compile(r"(?is)<(script|style|head|title|meta|link)[^>]*>.*?</\1>")
@@ -1156,6 +1408,14 @@ def _sanitize_html(html_body: str, rich: bool) -> str:
     )
 
 
+_CID_REFERENCE_RE = re.compile(r'(?i)\b(src|href)=["\']cid:([^"\']+)["\']')
+_HEAD_OPEN_TAG_RE = re.compile(r"(?i)<head[^>]*>")
+_SRCDOC_BASE_TAG = '<base target="_blank" rel="noopener noreferrer">'
+
+
+# Both helpers receive the html string held by the parsed-body cache, whose hash is
+# computed once, so repeat views of a message resolve to a dict hit.
+@lru_cache(maxsize=MESSAGE_BODY_CACHE_SIZE)
 def _build_full_html_srcdoc(html_body: str, message_id: int) -> str:
     def repl(match: re.Match[str]) -> str:
         attr = match.group(1)
@@ -1163,13 +1423,15 @@ def _build_full_html_srcdoc(html_body: str, message_id: int) -> str:
         target = quote(cid.strip("<>"), safe="")
         return f'{attr}="/message/{message_id}/inline/{target}"'
 
-    rewritten = re.sub(r'(?i)\b(src|href)=["\']cid:([^"\']+)["\']', repl, html_body)
-    base_tag = '<base target="_blank" rel="noopener noreferrer">'
-    if re.search(r"(?i)<head[^>]*>", rewritten):
-        return re.sub(r"(?i)<head[^>]*>", lambda m: f"{m.group(0)}{base_tag}", rewritten, 1)
-    return f"{base_tag}{rewritten}"
+    rewritten = _CID_REFERENCE_RE.sub(repl, html_body)
+    # One pass both finds and rewrites the first <head>; no match means there is no head.
+    with_base, replaced = _HEAD_OPEN_TAG_RE.subn(
+        lambda m: f"{m.group(0)}{_SRCDOC_BASE_TAG}", rewritten, count=1
+    )
+    return with_base if replaced else f"{_SRCDOC_BASE_TAG}{rewritten}"
 
 
+@lru_cache(maxsize=MESSAGE_BODY_CACHE_SIZE)
 def _is_minimal_html(html_body: str | None) -> bool:
     if not html_body:
         return True
@@ -1194,72 +1456,134 @@ def _delete_path(path: Path) -> None:
         LOGGER.exception("Failed to delete file at %s", path)
 
 
-def _delete_message(settings_db_path: Path, message_id: int) -> None:
-    message = _get_message(settings_db_path, message_id)
-    attachments = _get_message_attachments(settings_db_path, message_id)
-    db.log_inbox_event(
-        settings_db_path,
-        _now().isoformat(),
-        "deleted",
-        message_id=message_id,
-        envelope_rcpt=message.get("envelope_rcpt"),
-        quarantined=1 if message.get("quarantined") else 0,
-    )
-    for attachment in attachments:
-        _delete_path(Path(attachment["stored_path"]))
-    _delete_path(Path(message["eml_path"]))
+_INSERT_INBOX_EVENT_SQL = """
+    INSERT INTO inbox_events (
+        occurred_at,
+        event_type,
+        message_id,
+        envelope_rcpt,
+        quarantined
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+
+# Shared so bulk deletes reuse worker threads; the pool starts them lazily.
+_FILE_DELETE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=FILE_DELETE_WORKERS, thread_name_prefix="quail-delete"
+)
+
+
+def _delete_paths(paths: list[Path]) -> None:
+    if len(paths) <= FILE_DELETE_INLINE_MAX:
+        for path in paths:
+            _delete_path(path)
+        return
+    for _ in _FILE_DELETE_EXECUTOR.map(_delete_path, paths):
+        pass
+
+
+def _delete_messages(settings_db_path: Path, message_ids: list[int]) -> None:
+    occurred_at = _now().isoformat()
+    placeholders = ", ".join("?" for _ in message_ids)
     with db.get_connection(settings_db_path) as conn:
-        conn.execute("DELETE FROM messages WHERE id = ?", (message_id,))
+        conn.execute("BEGIN IMMEDIATE")
+        messages = conn.execute(
+            "SELECT id, eml_path, envelope_rcpt, quarantined FROM messages"
+            f" WHERE id IN ({placeholders})",
+            message_ids,
+        ).fetchall()
+        if len(messages) != len(set(message_ids)):
+            raise HTTPException(status_code=404, detail="Message not found.")
+        attachments = conn.execute(
+            f"SELECT stored_path FROM attachments WHERE message_id IN ({placeholders})",
+            message_ids,
+        ).fetchall()
+        conn.execute(f"DELETE FROM messages WHERE id IN ({placeholders})", message_ids)
+        conn.executemany(
+            _INSERT_INBOX_EVENT_SQL,
+            [
+                (
+                    occurred_at,
+                    "deleted",
+                    message["id"],
+                    message["envelope_rcpt"],
+                    1 if message["quarantined"] else 0,
+                )
+                for message in messages
+            ],
+        )
         conn.commit()
+    paths = [Path(row["stored_path"]) for row in attachments]
+    paths.extend(Path(message["eml_path"]) for message in messages)
+    _delete_paths(paths)
 
 
 def _delete_all_messages(settings_db_path: Path) -> int:
+    occurred_at = _now().isoformat()
     with db.get_connection(settings_db_path) as conn:
+        # Take the write lock before reading so an ingest cannot slip a message in
+        # between the SELECTs and the DELETE.
+        conn.execute("BEGIN IMMEDIATE")
         attachments = conn.execute("SELECT stored_path FROM attachments").fetchall()
         messages = conn.execute(
             "SELECT id, eml_path, envelope_rcpt, quarantined FROM messages"
         ).fetchall()
         conn.execute("DELETE FROM messages")
-        conn.commit()
-    for message in messages:
-        db.log_inbox_event(
-            settings_db_path,
-            _now().isoformat(),
-            "deleted",
-            message_id=message["id"],
-            envelope_rcpt=message["envelope_rcpt"],
-            quarantined=message["quarantined"],
+        conn.executemany(
+            _INSERT_INBOX_EVENT_SQL,
+            [
+                (
+                    occurred_at,
+                    "deleted",
+                    message["id"],
+                    message["envelope_rcpt"],
+                    message["quarantined"],
+                )
+                for message in messages
+            ],
         )
-    for attachment in attachments:
-        _delete_path(Path(attachment["stored_path"]))
-    for message in messages:
-        _delete_path(Path(message["eml_path"]))
+        conn.commit()
+    paths = [Path(row["stored_path"]) for row in attachments]
+    paths.extend(Path(message["eml_path"]) for message in messages)
+    _delete_paths(paths)
     return len(messages)
 
 
-def _update_message_status(settings_db_path: Path, message_id: int, status: str) -> None:
+def _update_messages_status(settings_db_path: Path, message_ids: list[int], status: str) -> None:
+    occurred_at = _now().isoformat()
+    quarantined = 0 if status == "INBOX" else 1
+    placeholders = ", ".join("?" for _ in message_ids)
     with db.get_connection(settings_db_path) as conn:
-        row = conn.execute(
-            "SELECT envelope_rcpt FROM messages WHERE id = ?",
-            (message_id,),
-        ).fetchone()
+        conn.execute("BEGIN IMMEDIATE")
+        envelope_rcpts = {
+            row["id"]: row["envelope_rcpt"]
+            for row in conn.execute(
+                f"SELECT id, envelope_rcpt FROM messages WHERE id IN ({placeholders})",
+                message_ids,
+            )
+        }
         conn.execute(
-            """
+            f"""
             UPDATE messages
             SET status = ?, quarantined = ?, quarantine_reason = ?
-            WHERE id = ?
+            WHERE id IN ({placeholders})
             """,
-            (status, 0 if status == "INBOX" else 1, None if status == "INBOX" else "", message_id),
+            (status, quarantined, None if status == "INBOX" else "", *message_ids),
+        )
+        conn.executemany(
+            _INSERT_INBOX_EVENT_SQL,
+            [
+                (
+                    occurred_at,
+                    "updated",
+                    message_id,
+                    envelope_rcpts.get(message_id),
+                    quarantined,
+                )
+                for message_id in message_ids
+            ],
         )
         conn.commit()
-    db.log_inbox_event(
-        settings_db_path,
-        _now().isoformat(),
-        "updated",
-        message_id=message_id,
-        envelope_rcpt=row["envelope_rcpt"] if row else None,
-        quarantined=0 if status == "INBOX" else 1,
-    )
 
 
 def _html_to_text(html_body: str) -> str:
@@ -1271,9 +1595,23 @@ def _html_to_text(html_body: str) -> str:
     return text.strip()
 
 
-def _parse_message_body(eml_path: Path, allow_html: bool) -> tuple[str, str | None]:
-    raw_bytes = eml_path.read_bytes()
-    message = BytesParser(policy=policy.default).parsebytes(raw_bytes)
+def _parse_message_body(eml_path: Path) -> tuple[str, str | None]:
+    stat = eml_path.stat()
+    return _parse_message_file_cached(eml_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=MESSAGE_BODY_CACHE_SIZE)
+def _parse_message_file_cached(
+    eml_path: Path, mtime_ns: int, size: int
+) -> tuple[str, str | None]:
+    # Stored .eml files are immutable, but keying on mtime and size keeps the cache
+    # honest if a file is ever rewritten in place.
+    return _parse_message_file(eml_path)
+
+
+def _parse_message_file(eml_path: Path) -> tuple[str, str | None]:
+    with eml_path.open("rb") as handle:
+        message = _MESSAGE_PARSER.parse(handle)
     body = ""
     html_body: str | None = None
     for part in message.walk():
@@ -1285,6 +1623,9 @@ def _parse_message_body(eml_path: Path, allow_html: bool) -> tuple[str, str | No
             body = part.get_content()
         if html_body is None and part.get_content_type() == "text/html":
             html_body = part.get_content()
+        # Stop once both bodies are found so trailing attachment parts are not walked.
+        if body and html_body is not None:
+            break
     if not body:
         if html_body:
             body = _html_to_text(html_body) or "(No plaintext body found.)"
@@ -1293,36 +1634,95 @@ def _parse_message_body(eml_path: Path, allow_html: bool) -> tuple[str, str | No
     return body, html_body
 
 
-@app.on_event("startup")
+def _compute_message_etag(
+    message: dict[str, str],
+    eml_path: Path,
+    is_admin: bool,
+    allow_html: bool,
+    csrf_token: str,
+) -> str:
+    try:
+        mtime_ns = eml_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    etag_source = "|".join(
+        str(part)
+        for part in (
+            message["id"],
+            message["quarantined"],
+            mtime_ns,
+            is_admin,
+            allow_html,
+            csrf_token,
+            templates.env.globals["static_version"],
+        )
+    )
+    return f'W/"{hashlib.sha1(etag_source.encode("utf-8")).hexdigest()}"'
+
+
+def _prepare_message_body(
+    eml_path: Path, allow_html: bool, message_id: int
+) -> tuple[str, str | None, bool]:
+    body, html_body = _parse_message_body(eml_path)
+    full_html_srcdoc = None
+    if allow_html and html_body:
+        full_html_srcdoc = _build_full_html_srcdoc(html_body, message_id)
+    return body, full_html_srcdoc, _is_minimal_html(html_body)
+
+
 async def _startup() -> None:
     configure_logging()
     settings = get_settings()
     db.init_db(settings.db_path)
     _init_settings(settings.db_path)
+    ADMIN_RATE_LIMITER.clear()
+    global ADMIN_LOG_TASK
+    ADMIN_LOG_TASK = asyncio.create_task(_admin_log_loop())
     if ENABLE_WS:
         global INBOX_HUB, WS_EVENT_TASK
         INBOX_HUB = InboxHub()
         WS_EVENT_TASK = asyncio.create_task(_ws_event_loop())
 
 
-@app.on_event("shutdown")
 async def _shutdown() -> None:
-    global WS_EVENT_TASK
+    global ADMIN_LOG_TASK, WS_EVENT_TASK
     if WS_EVENT_TASK:
         WS_EVENT_TASK.cancel()
         WS_EVENT_TASK = None
+    if ADMIN_LOG_TASK:
+        ADMIN_LOG_TASK.cancel()
+        ADMIN_LOG_TASK = None
+    _flush_admin_log_queue()
+    try:
+        db.optimize_db(get_settings().db_path)
+    except sqlite3.Error:
+        LOGGER.warning("SQLite optimize on shutdown failed.", exc_info=True)
+
 
+_HEALTH_BODY = b'{"status":"ok"}'
 
-@app.get("/", response_class=HTMLResponse)
-@app.get("/inbox", response_class=HTMLResponse)
-async def inbox(request: Request) -> HTMLResponse:
+
+@app.get("/healthz", include_in_schema=False)
+def healthz() -> Response:
+    return Response(_HEALTH_BODY, media_type="application/json")
+
+
+@app.get("/", response_class=HTMLResponse, response_model=None)
+@app.get("/inbox", response_class=HTMLResponse, response_model=None)
+def inbox(request: Request) -> Response:
     settings = get_settings()
     is_admin = _is_admin(request)
     inbox_filter = _normalize_inbox_filter(request.query_params.get("inbox"))
-    messages, next_cursor, has_more = _fetch_inbox_page(
-        settings.db_path, is_admin, inbox_filter, INBOX_PAGE_SIZE, None
+    messages, snapshot_etag, next_cursor, has_more = _build_inbox_snapshot(
+        settings.db_path, is_admin, inbox_filter, INBOX_PAGE_SIZE
     )
-    return templates.TemplateResponse(
+    # Revalidate on every load so a redirect back here after a delete or quarantine
+    # action never shows a stale cached list; Vary keeps admin and public renders apart.
+    etag = _compute_inbox_page_etag(snapshot_etag)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Cookie"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    return _render_page(
         "inbox.html",
         {
             "request": request,
@@ -1335,11 +1735,12 @@ async def inbox(request: Request) -> HTMLResponse:
             "next_cursor": next_cursor,
             "body_class": "list-view",
         },
+        headers=cache_headers,
     )
 
 
-@app.get("/api/inbox", response_class=JSONResponse)
-async def inbox_api(request: Request) -> JSONResponse:
+@app.get("/api/inbox", response_class=ORJSONResponse)
+def inbox_api(request: Request) -> ORJSONResponse:
     settings = get_settings()
     is_admin = _is_admin(request)
     inbox_filter = _normalize_inbox_filter(request.query_params.get("inbox"))
@@ -1350,7 +1751,7 @@ async def inbox_api(request: Request) -> JSONResponse:
     )
     if request.headers.get("if-none-match") == etag:
         return Response(status_code=304, headers={"ETag": etag})
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "messages": messages,
             "is_admin": is_admin,
@@ -1402,22 +1803,23 @@ async def inbox_ws(ws: WebSocket, inbox: str | None = None, limit: int | None =
         await INBOX_HUB.disconnect(ws, inbox_filter, is_admin, ws_limit)
 
 
-@app.get("/message/{message_id}", response_class=HTMLResponse)
-async def message_detail(request: Request, message_id: int) -> HTMLResponse:
+@app.get("/message/{message_id}", response_class=HTMLResponse, response_model=None)
+def message_detail(request: Request, message_id: int) -> Response:
     settings = get_settings()
     is_admin = _is_admin(request)
-    message = _get_message(settings.db_path, message_id)
+    message, attachments, allow_html = _get_message_detail(settings.db_path, message_id)
     if message["quarantined"] and not is_admin:
         raise HTTPException(status_code=404, detail="Message not found.")
-    allow_html = db.get_setting(settings.db_path, ALLOW_HTML_KEY) == "true"
-    body, html_body = _parse_message_body(Path(message["eml_path"]), allow_html)
-    attachments = _get_message_attachments(settings.db_path, message_id)
-    full_html_srcdoc = None
-    if allow_html and html_body:
-        full_html_srcdoc = _build_full_html_srcdoc(html_body, message_id)
-    is_minimal_html = _is_minimal_html(html_body)
+    eml_path = Path(message["eml_path"])
     csrf_token = _get_or_create_csrf_token(request)
-    response = templates.TemplateResponse(
+    etag = _compute_message_etag(message, eml_path, is_admin, allow_html, csrf_token)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Cookie"}
+    if request.cookies.get(CSRF_COOKIE) and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=cache_headers)
+    body, full_html_srcdoc, is_minimal_html = _prepare_message_body(
+        eml_path, allow_html, message_id
+    )
+    response = _render_page(
         "message.html",
         {
             "request": request,
@@ -1432,13 +1834,14 @@ async def message_detail(request: Request, message_id: int) -> HTMLResponse:
             "is_minimal_html": is_minimal_html,
             "csrf_token": csrf_token,
         },
+        headers=cache_headers,
     )
     _set_csrf_cookie(response, request, csrf_token)
     return response
 
 
 @app.get("/message/{message_id}/attachments/{attachment_id}")
-async def attachment_download(
+def attachment_download(
     request: Request, message_id: int, attachment_id: int
 ) -> FileResponse:
     settings = get_settings()
@@ -1446,7 +1849,7 @@ async def attachment_download(
     message = _get_message(settings.db_path, message_id)
     if message["quarantined"] and not is_admin:
         raise HTTPException(status_code=404, detail="Message not found.")
-    with db.get_connection(settings.db_path) as conn:
+    with db.get_pooled_connection(settings.db_path) as conn:
         row = conn.execute(
             """
             SELECT filename, stored_path, content_type
@@ -1468,7 +1871,7 @@ async def attachment_download(
 
 
 @app.get("/message/{message_id}/inline/{content_id}")
-async def inline_attachment(request: Request, message_id: int, content_id: str) -> Response:
+def inline_attachment(request: Request, message_id: int, content_id: str) -> Response:
     settings = get_settings()
     is_admin = _is_admin(request)
     message = _get_message(settings.db_path, message_id)
@@ -1477,8 +1880,8 @@ async def inline_attachment(request: Request, message_id: int, content_id: str)
     eml_path = Path(message["eml_path"])
     if not eml_path.exists():
         raise HTTPException(status_code=404, detail="Inline attachment not found.")
-    raw_bytes = eml_path.read_bytes()
-    parsed = BytesParser(policy=policy.default).parsebytes(raw_bytes)
+    with eml_path.open("rb") as handle:
+        parsed = _MESSAGE_PARSER.parse(handle)
     target = content_id.strip("<>")
     for part in parsed.walk():
         part_cid = part.get("Content-ID")
@@ -1493,7 +1896,7 @@ async def inline_attachment(request: Request, message_id: int, content_id: str)
 
 
 @app.post("/admin/message/{message_id}/delete")
-async def admin_delete_message(
+def admin_delete_message(
     request: Request, message_id: int, csrf_token: str | None = Form(None)
 ) -> RedirectResponse:
     if not _is_admin(request):
@@ -1501,7 +1904,7 @@ async def admin_delete_message(
     _require_csrf(request, csrf_token)
     settings = get_settings()
     message = _get_message(settings.db_path, message_id)
-    _delete_message(settings.db_path, message_id)
+    _delete_messages(settings.db_path, [message_id])
     _log_admin_action(
         settings.db_path,
         f"admin_message_deleted:{message_id}",
@@ -1520,32 +1923,30 @@ async def admin_delete_message(
     return RedirectResponse(url="/inbox", status_code=303)
 
 
-@app.get("/admin/unlock", response_class=HTMLResponse)
-async def admin_unlock(request: Request) -> HTMLResponse:
+@app.get("/admin/unlock", response_class=HTMLResponse, response_model=None)
+def admin_unlock(request: Request) -> Response:
     settings = get_settings()
     csrf_token = _get_or_create_csrf_token(request)
-    response = templates.TemplateResponse(
-        "admin_unlock.html",
-        {
-            "request": request,
-            "error": request.query_params.get("error"),
-            "pin_configured": bool(_get_admin_pin_hash(settings.db_path)),
-            "csrf_token": csrf_token,
-        },
+    response = HTMLResponse(
+        _render_unlock_page(
+            request.query_params.get("error"),
+            bool(_get_admin_pin_hash(settings.db_path)),
+            csrf_token,
+        )
     )
     _set_csrf_cookie(response, request, csrf_token)
     return response
 
 
-@app.post("/admin/unlock", response_class=HTMLResponse)
-async def admin_unlock_post(
+@app.post("/admin/unlock", response_class=HTMLResponse, response_model=None)
+def admin_unlock_post(
     request: Request, pin: str = Form(...), csrf_token: str | None = Form(None)
-) -> HTMLResponse:
+) -> Response:
     settings = get_settings()
     _require_csrf(request, csrf_token)
     source_ip = _get_client_ip(request)
     now = _now()
-    if _is_rate_limited(settings.db_path, source_ip, now):
+    if ADMIN_RATE_LIMITER.is_limited(source_ip, now.timestamp()):
         return RedirectResponse(url="/admin/unlock?error=rate_limited", status_code=303)
     if len(pin) > ADMIN_PIN_MAX_LEN or len(pin) < ADMIN_PIN_MIN_LEN:
         return RedirectResponse(url="/admin/unlock?error=pin_length", status_code=303)
@@ -1555,14 +1956,18 @@ async def admin_unlock_post(
     stored_hash = _get_admin_pin_hash(settings.db_path)
     pin_configured = bool(stored_hash)
     if stored_hash is None:
-        db.set_setting(settings.db_path, ADMIN_PIN_HASH_KEY, hash_pin(pin))
-        _log_admin_action(
+        db.set_settings(
             settings.db_path,
-            "admin_pin_initialized",
-            request,
-            entity="admin_pin",
-            before_state={"pin_configured": pin_configured},
-            after_state={"pin_configured": True},
+            {ADMIN_PIN_HASH_KEY: hash_pin(pin)},
+            [
+                _admin_action_row(
+                    "admin_pin_initialized",
+                    request,
+                    entity="admin_pin",
+                    before_state={"pin_configured": pin_configured},
+                    after_state={"pin_configured": True},
+                )
+            ],
         )
     elif stored_hash is not None:
         try:
@@ -1570,20 +1975,25 @@ async def admin_unlock_post(
         except (VerifyMismatchError, InvalidHash):
             is_valid = False
         if not is_valid:
-            _record_rate_limit_failure(settings.db_path, source_ip, now)
+            ADMIN_RATE_LIMITER.record_failure(source_ip, now.timestamp())
             return RedirectResponse(url="/admin/unlock?error=invalid", status_code=303)
 
-    _reset_rate_limit(settings.db_path, source_ip)
+    ADMIN_RATE_LIMITER.reset(source_ip)
     token = secrets.token_urlsafe(32)
-    token_hash = hash_pin(token)
+    token_hash = _session_token_digest(token)
     expires_at = now + ADMIN_SESSION_TTL
-    _set_session_state(settings.db_path, token_hash, expires_at)
-    _log_admin_action(
+    _set_session_state(
         settings.db_path,
-        "admin_unlock",
-        request,
-        entity="admin_session",
-        after_state={"expires_at": expires_at.isoformat()},
+        token_hash,
+        expires_at,
+        [
+            _admin_action_row(
+                "admin_unlock",
+                request,
+                entity="admin_session",
+                after_state={"expires_at": expires_at.isoformat()},
+            )
+        ],
     )
     response = RedirectResponse(url="/admin/settings", status_code=303)
     response.set_cookie(
@@ -1599,29 +2009,26 @@ async def admin_unlock_post(
     return response
 
 
-@app.get("/admin/settings", response_class=HTMLResponse)
-async def admin_settings(request: Request) -> HTMLResponse:
+@app.get("/admin/settings", response_class=HTMLResponse, response_model=None)
+def admin_settings(request: Request) -> Response:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
     settings = get_settings()
-    _log_admin_action(settings.db_path, "admin_settings_view", request, entity="settings")
+    _log_admin_action(
+        settings.db_path, "admin_settings_view", request, entity="settings", defer=True
+    )
     storage_stats = _get_storage_stats(settings.db_path)
     ingest_metrics = _get_ingest_metrics(settings.db_path)
-    ingest_attempts = [dict(row) for row in db.list_ingest_attempts(settings.db_path)]
+    # sqlite3.Row supports the keyed lookups templates make, so rows are passed as-is.
+    ingest_attempts = list(db.list_ingest_attempts(settings.db_path))
     rules_domain = _normalize_domain(request.query_params.get("rules_domain"))
     rules = db.list_address_rules(settings.db_path, rules_domain) if rules_domain else []
     csrf_token = _get_or_create_csrf_token(request)
     context = {
         "request": request,
         "csrf_token": csrf_token,
-        "allowed_mime_types": db.get_setting(settings.db_path, SETTINGS_ALLOWED_MIME_KEY)
-        or DEFAULT_ALLOWED_MIME_TYPES_VALUE,
-        "retention_days": db.get_setting(settings.db_path, RETENTION_DAYS_KEY)
-        or DEFAULT_RETENTION_DAYS,
-        "quarantine_retention_days": db.get_setting(settings.db_path, QUARANTINE_RETENTION_DAYS_KEY)
-        or DEFAULT_QUARANTINE_RETENTION_DAYS,
-        "allow_html": db.get_setting(settings.db_path, ALLOW_HTML_KEY) == "true",
+        **_get_general_settings(settings.db_path),
         "message_count": storage_stats["message_count"],
         "message_bytes": _format_bytes(storage_stats["message_bytes"]),
         "attachment_bytes": _format_bytes(storage_stats["attachment_bytes"]),
@@ -1635,22 +2042,22 @@ async def admin_settings(request: Request) -> HTMLResponse:
         "recent_ingest_rate": ingest_metrics["recent_ingest_rate"],
         "top_sender_domains": ingest_metrics["top_sender_domains"],
         "ingest_attempts": ingest_attempts,
-        "domain_policies": [dict(row) for row in db.list_domain_policies(settings.db_path)],
+        "domain_policies": db.list_domain_policies(settings.db_path),
         "domain_modes": DOMAIN_MODES,
         "domain_actions": DECISION_STATUSES,
         "rules_domain": rules_domain,
-        "rules": [dict(row) for row in rules],
+        "rules": rules,
         "rule_types": RULE_TYPES,
         "match_fields": MATCH_FIELDS,
         "rule_actions": DECISION_STATUSES,
     }
-    response = templates.TemplateResponse("admin_settings.html", context)
+    response = _render_page("admin_settings.html", context)
     _set_csrf_cookie(response, request, csrf_token)
     return response
 
 
 @app.post("/admin/settings")
-async def admin_settings_post(
+def admin_settings_post(
     request: Request,
     csrf_token: str | None = Form(None),
     allowed_mime_types: str = Form(""),
@@ -1665,15 +2072,7 @@ async def admin_settings_post(
     _require_csrf(request, csrf_token)
 
     settings = get_settings()
-    before_settings = {
-        "allowed_mime_types": db.get_setting(settings.db_path, SETTINGS_ALLOWED_MIME_KEY)
-        or DEFAULT_ALLOWED_MIME_TYPES_VALUE,
-        "retention_days": db.get_setting(settings.db_path, RETENTION_DAYS_KEY)
-        or DEFAULT_RETENTION_DAYS,
-        "quarantine_retention_days": db.get_setting(settings.db_path, QUARANTINE_RETENTION_DAYS_KEY)
-        or DEFAULT_QUARANTINE_RETENTION_DAYS,
-        "allow_html": db.get_setting(settings.db_path, ALLOW_HTML_KEY) == "true",
-    }
+    before_settings = _get_general_settings(settings.db_path)
     pin_configured_before = bool(_get_admin_pin_hash(settings.db_path))
     try:
         retention_value = int(retention_days)
@@ -1715,6 +2114,7 @@ async def admin_settings_post(
                 url="/admin/settings?error=pin_format", status_code=HTTP_303_SEE_OTHER
             )
         db.set_setting(settings.db_path, ADMIN_PIN_HASH_KEY, hash_pin(admin_pin))
+        _VERIFIED_ADMIN_PIN.clear()
         _log_admin_action(
             settings.db_path,
             "admin_pin_updated",
@@ -1740,8 +2140,8 @@ async def admin_settings_post(
     return RedirectResponse(url="/admin/settings?updated=1", status_code=HTTP_303_SEE_OTHER)
 
 
-@app.get("/admin/domain-policies", response_class=JSONResponse)
-async def admin_domain_policies(request: Request, admin_pin: str | None = None) -> JSONResponse:
+@app.get("/admin/domain-policies", response_class=ORJSONResponse)
+def admin_domain_policies(request: Request, admin_pin: str | None = None) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -1750,11 +2150,11 @@ async def admin_domain_policies(request: Request, admin_pin: str | None = None)
     if resolved_pin and not _verify_admin_pin(settings.db_path, resolved_pin):
         return _reject_admin_pin(request)
     policies = [dict(row) for row in db.list_domain_policies(settings.db_path)]
-    return JSONResponse({"policies": policies})
+    return ORJSONResponse({"policies": policies})
 
 
-@app.post("/admin/domain-policies", response_class=JSONResponse)
-async def admin_domain_policies_post(
+@app.post("/admin/domain-policies", response_class=ORJSONResponse)
+def admin_domain_policies_post(
     request: Request,
     csrf_token: str | None = Form(None),
     domain: str = Form(...),
@@ -1762,7 +2162,7 @@ async def admin_domain_policies_post(
     default_action: str = Form(...),
     quarantine_retention_days: str | None = Form(None),
     admin_pin: str | None = Form(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -1771,8 +2171,8 @@ async def admin_domain_policies_post(
     resolved_pin = _get_admin_pin_from_request(request, admin_pin)
     if not _verify_admin_pin(settings.db_path, resolved_pin):
         return _reject_admin_pin(request)
-    normalized_domain = domain.strip().lower()
-    if not normalized_domain or "@" in normalized_domain or " " in normalized_domain:
+    normalized_domain = _normalize_domain(domain)
+    if not normalized_domain:
         if _wants_json(request):
             raise HTTPException(status_code=400, detail="Invalid domain.")
         return RedirectResponse(url="/admin/settings?domain_error=domain", status_code=303)
@@ -1816,14 +2216,14 @@ async def admin_domain_policies_post(
         after_state=dict(policy),
     )
     if _wants_json(request):
-        return JSONResponse({"policy": dict(policy)})
+        return ORJSONResponse({"policy": dict(policy)})
     return RedirectResponse(
         url=f"/admin/settings?domain_saved={normalized_domain}", status_code=303
     )
 
 
-@app.get("/admin/rules", response_class=JSONResponse)
-async def admin_rules(request: Request, domain: str | None = None) -> JSONResponse:
+@app.get("/admin/rules", response_class=ORJSONResponse)
+def admin_rules(request: Request, domain: str | None = None) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -1837,11 +2237,11 @@ async def admin_rules(request: Request, domain: str | None = None) -> JSONRespon
     rules = [
         _serialize_rule(row) for row in db.list_address_rules(settings.db_path, normalized_domain)
     ]
-    return JSONResponse({"domain": normalized_domain, "rules": rules})
+    return ORJSONResponse({"domain": normalized_domain, "rules": rules})
 
 
-@app.post("/admin/rules", response_class=JSONResponse)
-async def admin_rules_post(
+@app.post("/admin/rules", response_class=ORJSONResponse)
+def admin_rules_post(
     request: Request,
     csrf_token: str | None = Form(None),
     domain: str = Form(...),
@@ -1853,7 +2253,7 @@ async def admin_rules_post(
     enabled: str | None = Form(None),
     note: str | None = Form(None),
     admin_pin: str | None = Form(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -1895,22 +2295,22 @@ async def admin_rules_post(
         after_state=_serialize_rule(row),
     )
     if _wants_json(request):
-        return JSONResponse({"rule": _serialize_rule(row)})
+        return ORJSONResponse({"rule": _serialize_rule(row)})
     return RedirectResponse(
         url=f"/admin/settings?rules_domain={quote(row['domain'])}&rules_saved=1",
         status_code=HTTP_303_SEE_OTHER,
     )
 
 
-@app.post("/admin/rules/test", response_class=JSONResponse)
-async def admin_rules_test(
+@app.post("/admin/rules/test", response_class=ORJSONResponse)
+def admin_rules_test(
     request: Request,
     csrf_token: str | None = Form(None),
     pattern: str = Form(...),
     sample: str = Form(""),
     admin_pin: str | None = Form(None),
     rules_domain: str | None = Form(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -1925,9 +2325,9 @@ async def admin_rules_test(
     regex_error = _validate_regex(cleaned_pattern)
     if regex_error:
         return _rule_error_response(request, rules_domain, regex_error)
-    matched = bool(re.search(cleaned_pattern, sample or ""))
+    matched = bool(_compile_regex(cleaned_pattern).search(sample or ""))
     if _wants_json(request):
-        return JSONResponse({"matched": matched})
+        return ORJSONResponse({"matched": matched})
     result = "matched" if matched else "no_match"
     normalized_domain = _normalize_domain(rules_domain) or ""
     domain_param = f"rules_domain={quote(normalized_domain)}&" if normalized_domain else ""
@@ -1937,8 +2337,8 @@ async def admin_rules_test(
     )
 
 
-@app.api_route("/admin/rules/{rule_id}", methods=["PUT", "POST"], response_class=JSONResponse)
-async def admin_rules_update(
+@app.api_route("/admin/rules/{rule_id}", methods=["PUT", "POST"], response_class=ORJSONResponse)
+def admin_rules_update(
     request: Request,
     rule_id: int,
     csrf_token: str | None = Form(None),
@@ -1950,7 +2350,7 @@ async def admin_rules_update(
     enabled: str | None = Form(None),
     note: str | None = Form(None),
     admin_pin: str | None = Form(None),
-) -> JSONResponse:
+) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -1997,20 +2397,20 @@ async def admin_rules_update(
         after_state=_serialize_rule(row),
     )
     if _wants_json(request):
-        return JSONResponse({"rule": _serialize_rule(row)})
+        return ORJSONResponse({"rule": _serialize_rule(row)})
     return RedirectResponse(
         url=f"/admin/settings?rules_domain={quote(row['domain'])}&rules_saved=1",
         status_code=HTTP_303_SEE_OTHER,
     )
 
 
-@app.delete("/admin/rules/{rule_id}", response_class=JSONResponse)
-async def admin_rules_delete(
+@app.delete("/admin/rules/{rule_id}", response_class=ORJSONResponse)
+def admin_rules_delete(
     request: Request,
     rule_id: int,
     admin_pin: str | None = None,
     csrf_token: str | None = None,
-) -> JSONResponse:
+) -> ORJSONResponse:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -2035,7 +2435,7 @@ async def admin_rules_delete(
         after_state=None,
     )
     if _wants_json(request):
-        return JSONResponse({"deleted": True, "rule_id": rule_id})
+        return ORJSONResponse({"deleted": True, "rule_id": rule_id})
     return RedirectResponse(
         url=f"/admin/settings?rules_domain={quote(existing['domain'])}&rules_deleted=1",
         status_code=HTTP_303_SEE_OTHER,
@@ -2043,17 +2443,17 @@ async def admin_rules_delete(
 
 
 @app.post("/admin/rules/{rule_id}/delete")
-async def admin_rules_delete_post(
+def admin_rules_delete_post(
     request: Request,
     rule_id: int,
     admin_pin: str | None = Form(None),
     csrf_token: str | None = Form(None),
 ) -> RedirectResponse:
-    return await admin_rules_delete(request, rule_id, admin_pin, csrf_token)
+    return admin_rules_delete(request, rule_id, admin_pin, csrf_token)
 
 
-@app.get("/admin/quarantine", response_class=HTMLResponse)
-async def admin_quarantine(request: Request) -> HTMLResponse:
+@app.get("/admin/quarantine", response_class=HTMLResponse, response_model=None)
+def admin_quarantine(request: Request) -> Response:
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
@@ -2075,9 +2475,11 @@ async def admin_quarantine(request: Request) -> HTMLResponse:
         start_date,
         end_date,
     )
-    _log_admin_action(settings.db_path, "admin_quarantine_view", request, entity="quarantine")
+    _log_admin_action(
+        settings.db_path, "admin_quarantine_view", request, entity="quarantine", defer=True
+    )
     csrf_token = _get_or_create_csrf_token(request)
-    response = templates.TemplateResponse(
+    response = _render_page(
         "admin_quarantine.html",
         {
             "request": request,
@@ -2097,7 +2499,7 @@ async def admin_quarantine(request: Request) -> HTMLResponse:
 
 
 @app.post("/admin/quarantine/restore")
-async def admin_quarantine_restore(
+def admin_quarantine_restore(
     request: Request,
     csrf_token: str | None = Form(None),
     admin_pin: str | None = Form(None),
@@ -2106,12 +2508,13 @@ async def admin_quarantine_restore(
     recipient_localpart: str | None = Form(None),
     start_date: str | None = Form(None),
     end_date: str | None = Form(None),
+    message_id: list[str] = Form([]),
 ):
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
     _require_csrf(request, csrf_token)
-    message_ids = await _extract_message_ids(request)
+    message_ids = _parse_message_ids(message_id)
     settings = get_settings()
     resolved_pin = _get_admin_pin_from_request(request, admin_pin)
     if not _verify_admin_pin(settings.db_path, resolved_pin):
@@ -2131,18 +2534,22 @@ async def admin_quarantine_restore(
             status_code=HTTP_303_SEE_OTHER,
         )
     before_rows = {row["id"]: row for row in _fetch_messages_by_ids(settings.db_path, message_ids)}
-    for message_id_value in message_ids:
-        _update_message_status(settings.db_path, message_id_value, "INBOX")
-        _log_admin_action(
-            settings.db_path,
-            f"admin_quarantine_restore:{message_id_value}",
-            request,
-            entity=f"message:{message_id_value}",
-            before_state=before_rows.get(message_id_value),
-            after_state={"id": message_id_value, "status": "INBOX"},
-        )
+    _update_messages_status(settings.db_path, message_ids, "INBOX")
+    db.log_admin_actions(
+        settings.db_path,
+        [
+            _admin_action_row(
+                f"admin_quarantine_restore:{message_id_value}",
+                request,
+                entity=f"message:{message_id_value}",
+                before_state=before_rows.get(message_id_value),
+                after_state={"id": message_id_value, "status": "INBOX"},
+            )
+            for message_id_value in message_ids
+        ],
+    )
     if _wants_json(request):
-        return JSONResponse({"restored": message_ids})
+        return ORJSONResponse({"restored": message_ids})
     query = _build_quarantine_query(
         domain, sender_domain, recipient_localpart, start_date, end_date
     )
@@ -2153,7 +2560,7 @@ async def admin_quarantine_restore(
 
 
 @app.post("/admin/quarantine/delete")
-async def admin_quarantine_delete(
+def admin_quarantine_delete(
     request: Request,
     csrf_token: str | None = Form(None),
     admin_pin: str | None = Form(None),
@@ -2162,12 +2569,13 @@ async def admin_quarantine_delete(
     recipient_localpart: str | None = Form(None),
     start_date: str | None = Form(None),
     end_date: str | None = Form(None),
+    message_id: list[str] = Form([]),
 ):
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
     _require_csrf(request, csrf_token)
-    message_ids = await _extract_message_ids(request)
+    message_ids = _parse_message_ids(message_id)
     settings = get_settings()
     resolved_pin = _get_admin_pin_from_request(request, admin_pin)
     if not _verify_admin_pin(settings.db_path, resolved_pin):
@@ -2187,18 +2595,22 @@ async def admin_quarantine_delete(
             status_code=HTTP_303_SEE_OTHER,
         )
     before_rows = {row["id"]: row for row in _fetch_messages_by_ids(settings.db_path, message_ids)}
-    for message_id_value in message_ids:
-        _delete_message(settings.db_path, message_id_value)
-        _log_admin_action(
-            settings.db_path,
-            f"admin_quarantine_delete:{message_id_value}",
-            request,
-            entity=f"message:{message_id_value}",
-            before_state=before_rows.get(message_id_value),
-            after_state=None,
-        )
+    _delete_messages(settings.db_path, message_ids)
+    db.log_admin_actions(
+        settings.db_path,
+        [
+            _admin_action_row(
+                f"admin_quarantine_delete:{message_id_value}",
+                request,
+                entity=f"message:{message_id_value}",
+                before_state=before_rows.get(message_id_value),
+                after_state=None,
+            )
+            for message_id_value in message_ids
+        ],
+    )
     if _wants_json(request):
-        return JSONResponse({"deleted": message_ids})
+        return ORJSONResponse({"deleted": message_ids})
     query = _build_quarantine_query(
         domain, sender_domain, recipient_localpart, start_date, end_date
     )
@@ -2208,8 +2620,18 @@ async def admin_quarantine_delete(
     )
 
 
+_SELECTION_MATCH_VALUES: dict[str, Callable[[dict[str, str], str], str | None]] = {
+    "RCPT_LOCALPART": lambda row, localpart: localpart,
+    "MAIL_FROM": lambda row, localpart: _extract_primary_address(row.get("from_addr")),
+    "FROM_DOMAIN": lambda row, localpart: _extract_domain(
+        _extract_primary_address(row.get("from_addr"))
+    ),
+    "SUBJECT": lambda row, localpart: row.get("subject"),
+}
+
+
 @app.post("/admin/quarantine/rule-from-selection")
-async def admin_quarantine_rule_from_selection(
+def admin_quarantine_rule_from_selection(
     request: Request,
     csrf_token: str | None = Form(None),
     rule_type: str = Form(...),
@@ -2220,12 +2642,13 @@ async def admin_quarantine_rule_from_selection(
     recipient_localpart: str | None = Form(None),
     start_date: str | None = Form(None),
     end_date: str | None = Form(None),
+    message_id: list[str] = Form([]),
 ):
     redirect = _require_admin_session(request)
     if redirect:
         return redirect
     _require_csrf(request, csrf_token)
-    message_ids = await _extract_message_ids(request)
+    message_ids = _parse_message_ids(message_id)
     settings = get_settings()
     resolved_pin = _get_admin_pin_from_request(request, admin_pin)
     if not _verify_admin_pin(settings.db_path, resolved_pin):
@@ -2251,26 +2674,16 @@ async def admin_quarantine_rule_from_selection(
     if normalized_match_field not in MATCH_FIELDS:
         raise HTTPException(status_code=400, detail="Invalid match field.")
     action = "INBOX" if normalized_rule_type == "ALLOW" else "QUARANTINE"
-    rows = _fetch_messages_by_ids(settings.db_path, message_ids)
-    created_rules = []
+    rows = _fetch_messages_by_ids(settings.db_path, message_ids, quarantined_only=True)
+    extract_match_value = _SELECTION_MATCH_VALUES[normalized_match_field]
+    new_rules: list[db.AddressRuleRow] = []
     seen = set()
-    now = _now().isoformat()
     for row in rows:
-        if row.get("status") != "QUARANTINE" and not row.get("quarantined"):
-            continue
         envelope_rcpt = row.get("envelope_rcpt") or ""
         localpart, domain_value = _split_envelope_rcpt(envelope_rcpt)
         if not domain_value:
             continue
-        raw_from = row.get("from_addr")
-        if normalized_match_field == "RCPT_LOCALPART":
-            match_value = localpart
-        elif normalized_match_field == "MAIL_FROM":
-            match_value = _extract_primary_address(raw_from)
-        elif normalized_match_field == "FROM_DOMAIN":
-            match_value = _extract_domain(_extract_primary_address(raw_from))
-        else:
-            match_value = row.get("subject")
+        match_value = extract_match_value(row, localpart)
         if not match_value:
             continue
         pattern = f"^{re.escape(match_value)}$"
@@ -2278,26 +2691,32 @@ async def admin_quarantine_rule_from_selection(
         if key in seen:
             continue
         seen.add(key)
-        created_rule = db.create_address_rule(
-            settings.db_path,
-            domain_value,
-            normalized_rule_type,
-            normalized_match_field,
-            pattern,
-            0,
-            action,
-            1,
-            f"Created from quarantine selection (message {row['id']}).",
-            now,
+        new_rules.append(
+            (
+                domain_value,
+                normalized_rule_type,
+                normalized_match_field,
+                pattern,
+                0,
+                action,
+                1,
+                f"Created from quarantine selection (message {row['id']}).",
+            )
         )
-        created_rules.append(created_rule)
-        _log_admin_action(
+    created_rules = db.create_address_rules(settings.db_path, new_rules, _now().isoformat())
+    if created_rules:
+        db.log_admin_actions(
             settings.db_path,
-            f"admin_quarantine_rule_created:{created_rule['id']}",
-            request,
-            entity=f"address_rule:{created_rule['id']}",
-            before_state=None,
-            after_state=_serialize_rule(created_rule),
+            [
+                _admin_action_row(
+                    f"admin_quarantine_rule_created:{created_rule['id']}",
+                    request,
+                    entity=f"address_rule:{created_rule['id']}",
+                    before_state=None,
+                    after_state=_serialize_rule(created_rule),
+                )
+                for created_rule in created_rules
+            ],
         )
     if not created_rules:
         if _wants_json(request):
@@ -2310,7 +2729,7 @@ async def admin_quarantine_rule_from_selection(
             status_code=HTTP_303_SEE_OTHER,
         )
     if _wants_json(request):
-        return JSONResponse({"created_rule_ids": [row["id"] for row in created_rules]})
+        return ORJSONResponse({"created_rule_ids": [row["id"] for row in created_rules]})
     query = _build_quarantine_query(
         domain, sender_domain, recipient_localpart, start_date, end_date
     )
@@ -2325,14 +2744,14 @@ async def admin_quarantine_rule_from_selection(
 
 
 @app.post("/admin/messages/clear")
-async def admin_clear_messages(
+def admin_clear_messages(
     request: Request, csrf_token: str | None = Form(None)
 ) -> RedirectResponse:
     if not _is_admin(request):
         return RedirectResponse(url="/admin/unlock", status_code=303)
     _require_csrf(request, csrf_token)
     settings = get_settings()
-    with db.get_connection(settings.db_path) as conn:
+    with db.get_pooled_connection(settings.db_path) as conn:
         before_count = conn.execute("SELECT COUNT(*) AS count FROM messages").fetchone()["count"]
     deleted_count = _delete_all_messages(settings.db_path)
     _log_admin_action(
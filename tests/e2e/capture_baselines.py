@@ -1,39 +1,51 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import os
 from pathlib import Path
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 
 
 def _normalize_base_url(value: str) -> str:
     return value.rstrip("/")
 
 
-def _capture_theme(browser, base_url: str, theme: str, out_dir: Path) -> None:
-    context = browser.new_context(viewport={"width": 1280, "height": 720})
-    context.add_init_script(f"localStorage.setItem('quailTheme', '{theme}')")
-    page = context.new_page()
+async def _capture_theme(browser, base_url: str, theme: str, out_dir: Path) -> None:
+    context = await browser.new_context(viewport={"width": 1280, "height": 720})
+    await context.add_init_script(f"localStorage.setItem('quailTheme', '{theme}')")
+    page = await context.new_page()
 
-    page.goto(f"{base_url}/inbox", wait_until="domcontentloaded")
-    page.wait_for_selector("table.inbox-table")
-    page.wait_for_function(
+    await page.goto(f"{base_url}/inbox", wait_until="domcontentloaded")
+    await page.wait_for_selector("table.inbox-table")
+    await page.wait_for_function(
         "document.documentElement.dataset.theme === localStorage.getItem('quailTheme')"
     )
 
     message_row = page.locator("tr[data-message-id]").first
-    message_id = message_row.get_attribute("data-message-id")
+    message_id = await message_row.get_attribute("data-message-id")
     if not message_id:
         raise SystemExit("No inbox rows found; seed data required.")
 
-    page.screenshot(path=out_dir / f"inbox-{theme}.png", full_page=True)
+    await page.screenshot(path=out_dir / f"inbox-{theme}.png", full_page=True)
 
-    page.goto(f"{base_url}/message/{message_id}", wait_until="domcontentloaded")
-    page.wait_for_selector(".message-page")
-    page.screenshot(path=out_dir / f"message-{theme}.png", full_page=True)
+    await page.goto(f"{base_url}/message/{message_id}", wait_until="domcontentloaded")
+    await page.wait_for_selector(".message-page")
+    await page.screenshot(path=out_dir / f"message-{theme}.png", full_page=True)
 
-    context.close()
+    await context.close()
+
+
+async def _capture_all(base_url: str, out_dir: Path) -> None:
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch()
+        # The themes share nothing, so each gets its own context and the page loads
+        # and screenshots of both overlap.
+        await asyncio.gather(
+            *(_capture_theme(browser, base_url, theme, out_dir) for theme in ("light", "dark"))
+        )
+        await browser.close()
 
 
 def main() -> int:
@@ -48,11 +60,7 @@ def main() -> int:
     out_dir = Path(__file__).parent / "baselines"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch()
-        for theme in ("light", "dark"):
-            _capture_theme(browser, base_url, theme, out_dir)
-        browser.close()
+    asyncio.run(_capture_all(base_url, out_dir))
 
     if args.update:
         pass
@@ -36,23 +36,29 @@ def main() -> int:
         response = page.goto(f"{base_url}/inbox", wait_until="load")
         page.wait_for_function("typeof wsEnabled !== 'undefined'")
 
-        html_bytes = 0
-        if response:
-            body = response.body()
-            html_bytes = len(body)
-
-        nav_entry = page.evaluate("performance.getEntriesByType('navigation')[0] || null")
-        resource_count = page.evaluate("performance.getEntriesByType('resource').length")
-        ws_enabled = page.evaluate("typeof wsEnabled === 'undefined' ? null : Boolean(wsEnabled)")
+        metrics = page.evaluate(
+            """() => {
+                const nav = performance.getEntriesByType('navigation')[0];
+                return {
+                    nav: nav ? nav.toJSON() : null,
+                    resourceCount: performance.getEntriesByType('resource').length,
+                    wsEnabled: typeof wsEnabled === 'undefined' ? null : Boolean(wsEnabled),
+                };
+            }"""
+        )
+        nav_entry = metrics["nav"]
+        # decodedBodySize matches len(response.body()) without pulling the body back
+        # over the protocol.
+        html_bytes = nav_entry.get("decodedBodySize", 0) if response and nav_entry else 0
 
         result = {
             "url": f"{base_url}/inbox",
             "html_bytes": html_bytes,
             "request_count": len(requests),
-            "resource_count": resource_count,
+            "resource_count": metrics["resourceCount"],
             "domcontentloaded_ms": nav_entry.get("domContentLoadedEventEnd") if nav_entry else None,
             "load_ms": nav_entry.get("loadEventEnd") if nav_entry else None,
-            "ws_enabled": ws_enabled,
+            "ws_enabled": metrics["wsEnabled"],
         }
 
         out_path.write_text(json.dumps(result, indent=2))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 
 import pytest
 
@@ -8,6 +9,20 @@ pytest.importorskip("playwright.sync_api")
 from playwright.sync_api import sync_playwright  # noqa: E402
 
 
+E2E_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    # Every worker would drive the same external Quail server, which holds a single
+    # admin session, so under pytest-xdist (--dist loadgroup) the suite stays on one
+    # worker instead of racing on shared server state.
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    for item in items:
+        if E2E_DIR in item.path.parents:
+            item.add_marker(pytest.mark.xdist_group("e2e"))
+
+
 def _normalize_base_url(value: str) -> str:
     return value.rstrip("/")
 
@@ -31,13 +46,41 @@ def browser():
         browser.close()
 
 
-@pytest.fixture()
+def _new_context(browser):
+    return browser.new_context(viewport={"width": 1280, "height": 720})
+
+
+@pytest.fixture(scope="session")
 def context(browser):
-    context = browser.new_context(viewport={"width": 1280, "height": 720})
+    # Starting a context dominates per-test cost, so tests share one and the
+    # reset_browser_state fixture clears what a test leaves behind.
+    context = _new_context(browser)
     yield context
     context.close()
 
 
+@pytest.fixture()
+def fresh_context(browser):
+    context = _new_context(browser)
+    yield context
+    context.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_browser_state(request, base_url):
+    yield
+    if "context" not in request.fixturenames:
+        return
+    context = request.getfixturevalue("context")
+    context.clear_cookies()
+    page = context.new_page()
+    try:
+        page.goto(f"{base_url}/healthz")
+        page.evaluate("localStorage.clear()")
+    finally:
+        page.close()
+
+
 @pytest.fixture()
 def page(context):
     page = context.new_page()
@@ -7,6 +7,8 @@ from playwright.sync_api import expect
 
 from tests.e2e.utils import get_first_message_id, goto_inbox
 
+_ADMIN_SETTINGS_URL_RE = re.compile(r".*/admin/settings$")
+
 
 def test_admin_unlock_shows_delete_button(page, base_url, admin_pin) -> None:
     if not admin_pin:
@@ -14,7 +16,7 @@ def test_admin_unlock_shows_delete_button(page, base_url, admin_pin) -> None:
     page.goto(f"{base_url}/admin/unlock", wait_until="domcontentloaded")
     page.fill("#pin", admin_pin)
     page.click("form.admin-unlock-form button[type='submit']")
-    page.wait_for_url(re.compile(r".*/admin/settings$"))
+    page.wait_for_url(_ADMIN_SETTINGS_URL_RE)
     expect(page.locator("h1.page-title")).to_have_text("Admin Settings")
 
     goto_inbox(page, base_url)
@@ -6,7 +6,16 @@ from urllib.parse import quote
 import pytest
 from playwright.sync_api import expect
 
-from tests.e2e.utils import get_first_message_id, get_first_message_row, goto_inbox
+from tests.e2e.utils import (
+    get_first_message_id,
+    get_first_message_row,
+    goto_inbox,
+    wait_for_stable,
+)
+
+_MESSAGE_URL_RE = re.compile(r"/message/\d+")
+_ACTIVE_CLASS_RE = re.compile(r"active")
+_ROW_HIDDEN_CLASS_RE = re.compile(r"row-hidden")
 
 
 def test_inbox_loads(page, base_url) -> None:
@@ -33,7 +42,7 @@ def test_row_click_opens_message_view(page, base_url) -> None:
     row = get_first_message_row(page)
     with page.expect_navigation(wait_until="domcontentloaded"):
         row.click()
-    assert re.search(r"/message/\d+", page.url)
+    assert _MESSAGE_URL_RE.search(page.url)
     expect(page.locator(".message-page")).to_be_visible()
 
 
@@ -46,12 +55,12 @@ def test_message_tabs_switch(page, base_url) -> None:
     attachments_tab = page.locator("[data-tab='attachments']")
     attachments_tab.click()
     expect(attachments_tab).to_have_attribute("aria-selected", "true")
-    expect(page.locator("[data-tab-panel='attachments']")).to_have_class(re.compile(r"active"))
+    expect(page.locator("[data-tab-panel='attachments']")).to_have_class(_ACTIVE_CLASS_RE)
 
     text_tab = page.locator("[data-tab='text']")
     text_tab.click()
     expect(text_tab).to_have_attribute("aria-selected", "true")
-    expect(page.locator("[data-tab-panel='text']")).to_have_class(re.compile(r"active"))
+    expect(page.locator("[data-tab-panel='text']")).to_have_class(_ACTIVE_CLASS_RE)
 
 
 def test_iframe_attributes_when_present(page, base_url) -> None:
@@ -71,7 +80,9 @@ def test_theme_persistence(page, base_url) -> None:
     initial_theme = page.evaluate("document.documentElement.dataset.theme || 'light'")
     toggle = page.locator("#theme-toggle")
     toggle.click()
-    page.wait_for_timeout(150)
+    wait_for_stable(
+        page, "initial => document.documentElement.dataset.theme !== initial", arg=initial_theme
+    )
     updated_theme = page.evaluate("document.documentElement.dataset.theme")
     assert updated_theme and updated_theme != initial_theme
     stored_theme = page.evaluate("localStorage.getItem('quailTheme')")
@@ -85,15 +96,13 @@ def test_theme_persistence(page, base_url) -> None:
     assert reloaded_theme == updated_theme
 
 
-def test_notification_toggle_persists(browser, base_url) -> None:
-    context = browser.new_context(viewport={"width": 1280, "height": 720})
-    context.grant_permissions(["notifications"], origin=base_url)
-    page = context.new_page()
+def test_notification_toggle_persists(fresh_context, base_url) -> None:
+    fresh_context.grant_permissions(["notifications"], origin=base_url)
+    page = fresh_context.new_page()
     goto_inbox(page, base_url)
 
     permission = page.evaluate("Notification.permission")
     if permission != "granted":
-        context.close()
         pytest.skip(f"Notification permission not granted (got: {permission}).")
 
     toggle = page.locator("#notify-toggle")
@@ -105,8 +114,6 @@ def test_notification_toggle_persists(browser, base_url) -> None:
     page.reload(wait_until="domcontentloaded")
     expect(toggle).to_have_attribute("aria-pressed", "true")
 
-    context.close()
-
 
 def test_pause_toggle_sets_session_state(page, base_url) -> None:
     goto_inbox(page, base_url)
@@ -127,7 +134,7 @@ def test_trash_hides_selected_rows(page, base_url) -> None:
 
     row.locator("input.message-select").check()
     page.locator("#trash-button").click()
-    expect(row).to_have_class(re.compile(r"row-hidden"))
+    expect(row).to_have_class(_ROW_HIDDEN_CLASS_RE)
     hidden_ids = page.evaluate("JSON.parse(sessionStorage.getItem('quailHiddenMessages') || '[]')")
     assert message_id in hidden_ids
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from tests.e2e.utils import goto_inbox, wait_for_inbox_script
+from tests.e2e.utils import goto_inbox, wait_for_inbox_script, wait_for_stable
 
 
 def test_inbox_api_etag_roundtrip(context, base_url) -> None:
@@ -18,7 +18,12 @@ def test_ws_or_polling_health(page_with_console, base_url) -> None:
     page, errors = page_with_console
     goto_inbox(page, base_url)
     wait_for_inbox_script(page)
-    page.wait_for_timeout(1000)
+    wait_for_stable(
+        page,
+        """() => (typeof ws !== "undefined" && ws && ws.readyState === 1)
+          || (typeof refreshTimer !== "undefined" && refreshTimer !== null)""",
+        timeout=3000,
+    )
     state = page.evaluate("""() => ({
         wsEnabled: typeof wsEnabled === "undefined" ? null : wsEnabled,
         hasWs: typeof ws === "undefined" ? false : Boolean(ws),
@@ -31,5 +36,5 @@ def test_ws_or_polling_health(page_with_console, base_url) -> None:
     else:
         assert state["hasPolling"]
 
-    page.wait_for_timeout(1000)
+    page.wait_for_load_state("networkidle")
     assert not errors
@@ -19,6 +19,10 @@ def wait_for_inbox_script(page) -> None:
     page.wait_for_function("typeof wsEnabled !== 'undefined'")
 
 
+def wait_for_stable(page, js_expr: str, arg=None, timeout: int = 2000) -> None:
+    page.wait_for_function(js_expr, arg=arg, timeout=timeout)
+
+
 def get_first_message_row(page):
     try:
         page.wait_for_selector("tr[data-message-id]", timeout=5000)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+import secrets
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from email.message import EmailMessage
@@ -11,7 +13,7 @@ from uuid import uuid4
 from fastapi.testclient import TestClient
 
 from quail import db, settings
-from quail.web import app
+from quail.web import CSRF_COOKIE, app
 
 
 def build_email(
@@ -53,13 +55,13 @@ def build_client(tmp_path, monkeypatch):
 
 
 def get_csrf_token(client: TestClient) -> str:
-    token = client.cookies.get("quail_csrf")
+    token = client.cookies.get(CSRF_COOKIE)
     if token:
         return token
-    response = client.get("/admin/unlock")
-    assert response.status_code == 200
-    token = client.cookies.get("quail_csrf")
-    assert token
+    # CSRF is a double-submit check against the cookie, so mint it locally instead
+    # of fetching /admin/unlock just to have the server set it.
+    token = secrets.token_urlsafe(32)
+    client.cookies.set(CSRF_COOKIE, token, domain="testserver.local")
     return token
 
 
@@ -73,9 +75,78 @@ def unlock_admin(client: TestClient, pin: str = "1234") -> None:
     assert response.status_code == 303
 
 
-def write_eml(eml_path: Path, message: EmailMessage) -> None:
+def _fast_write_bytes(path: Path, data: bytes) -> int:
+    """Write data with a single open/write/close and return its size; no fsync."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+    return len(data)
+
+
+def write_eml(eml_path: Path, message: EmailMessage) -> int:
     eml_path.parent.mkdir(parents=True, exist_ok=True)
-    eml_path.write_bytes(message.as_bytes())
+    return _fast_write_bytes(eml_path, message.as_bytes())
+
+
+_INSERT_MESSAGE_SQL = """
+    INSERT INTO messages (
+        received_at,
+        envelope_rcpt,
+        from_addr,
+        subject,
+        date,
+        message_id,
+        size_bytes,
+        eml_path,
+        quarantined,
+        status,
+        quarantine_reason,
+        ingest_decision_meta
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_ATTACHMENT_SQL = """
+    INSERT INTO attachments (message_id, filename, stored_path, content_type, size_bytes)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def insert_messages(settings_obj, specs: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Insert several messages in one transaction; specs take insert_message kwargs."""
+    rows = []
+    results = []
+    settings_obj.eml_dir.mkdir(parents=True, exist_ok=True)
+    for spec in specs:
+        message: EmailMessage = spec["message"]
+        received_at = spec.get("received_at") or datetime.now(tz=timezone.utc)
+        eml_path = settings_obj.eml_dir / f"msg-{received_at.timestamp()}-{uuid4().hex}.eml"
+        size_bytes = _fast_write_bytes(eml_path, message.as_bytes())
+        rows.append(
+            (
+                received_at.isoformat(),
+                spec["envelope_rcpt"],
+                message.get("From"),
+                message.get("Subject"),
+                message.get("Date") or received_at.isoformat(),
+                message.get("Message-ID") or f"msg-{received_at.timestamp()}",
+                size_bytes,
+                str(eml_path),
+                spec.get("quarantined", 0),
+                spec.get("status", "INBOX"),
+                None,
+                None,
+            )
+        )
+        results.append({"eml_path": eml_path})
+    with db.get_connection(settings_obj.db_path) as conn:
+        for row, result in zip(rows, results):
+            result["id"] = int(conn.execute(_INSERT_MESSAGE_SQL, row).lastrowid)
+        conn.commit()
+    return results
 
 
 def insert_message(
@@ -87,46 +158,44 @@ def insert_message(
     quarantined: int = 0,
     received_at: datetime | None = None,
 ) -> dict[str, object]:
-    received_at = received_at or datetime.now(tz=timezone.utc)
-    eml_path = settings_obj.eml_dir / f"msg-{received_at.timestamp()}-{uuid4().hex}.eml"
-    write_eml(eml_path, message)
-    size_bytes = eml_path.stat().st_size
-    message_id = message.get("Message-ID") or f"msg-{received_at.timestamp()}"
-    with db.get_connection(settings_obj.db_path) as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO messages (
-                received_at,
-                envelope_rcpt,
-                from_addr,
-                subject,
-                date,
-                message_id,
-                size_bytes,
-                eml_path,
-                quarantined,
-                status,
-                quarantine_reason,
-                ingest_decision_meta
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    (result,) = insert_messages(
+        settings_obj,
+        [
+            {
+                "message": message,
+                "envelope_rcpt": envelope_rcpt,
+                "status": status,
+                "quarantined": quarantined,
+                "received_at": received_at,
+            }
+        ],
+    )
+    return result
+
+
+def insert_attachments(settings_obj, specs: list[dict[str, object]]) -> list[dict[str, object]]:
+    """Insert several attachments in one transaction; specs take insert_attachment kwargs."""
+    rows = []
+    results = []
+    settings_obj.attachment_dir.mkdir(parents=True, exist_ok=True)
+    for spec in specs:
+        attachment_path = settings_obj.attachment_dir / spec["filename"]
+        size_bytes = _fast_write_bytes(attachment_path, spec["content"])
+        rows.append(
             (
-                received_at.isoformat(),
-                envelope_rcpt,
-                message.get("From"),
-                message.get("Subject"),
-                message.get("Date") or received_at.isoformat(),
-                message_id,
+                spec["message_id"],
+                spec["filename"],
+                str(attachment_path),
+                spec["content_type"],
                 size_bytes,
-                str(eml_path),
-                quarantined,
-                status,
-                None,
-                None,
-            ),
+            )
         )
+        results.append({"path": attachment_path})
+    with db.get_connection(settings_obj.db_path) as conn:
+        for row, result in zip(rows, results):
+            result["id"] = int(conn.execute(_INSERT_ATTACHMENT_SQL, row).lastrowid)
         conn.commit()
-    return {"id": int(cursor.lastrowid), "eml_path": eml_path}
+    return results
 
 
 def insert_attachment(
@@ -137,17 +206,15 @@ def insert_attachment(
     content_type: str,
     content: bytes,
 ) -> dict[str, object]:
-    attachment_path = settings_obj.attachment_dir / filename
-    attachment_path.parent.mkdir(parents=True, exist_ok=True)
-    attachment_path.write_bytes(content)
-    size_bytes = attachment_path.stat().st_size
-    with db.get_connection(settings_obj.db_path) as conn:
-        cursor = conn.execute(
-            """
-            INSERT INTO attachments (message_id, filename, stored_path, content_type, size_bytes)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (message_id, filename, str(attachment_path), content_type, size_bytes),
-        )
-        conn.commit()
-    return {"id": int(cursor.lastrowid), "path": attachment_path}
+    (result,) = insert_attachments(
+        settings_obj,
+        [
+            {
+                "message_id": message_id,
+                "filename": filename,
+                "content_type": content_type,
+                "content": content,
+            }
+        ],
+    )
+    return result
@@ -12,7 +12,9 @@ from tests.helpers import (
     build_email,
     get_csrf_token,
     insert_attachment,
+    insert_attachments,
     insert_message,
+    insert_messages,
     unlock_admin,
 )
 
@@ -60,29 +62,35 @@ def test_admin_clear_messages_removes_all(tmp_path, monkeypatch) -> None:
     with build_client(tmp_path, monkeypatch) as (client, settings_obj):
         unlock_admin(client, pin="1234")
 
-        first = insert_message(
+        first, second = insert_messages(
             settings_obj,
-            message=build_email(subject="One", to_addr="user@mail.example.test"),
-            envelope_rcpt="user@mail.example.test",
-        )
-        second = insert_message(
-            settings_obj,
-            message=build_email(subject="Two", to_addr="user@mail.example.test"),
-            envelope_rcpt="user@mail.example.test",
+            [
+                {
+                    "message": build_email(subject="One", to_addr="user@mail.example.test"),
+                    "envelope_rcpt": "user@mail.example.test",
+                },
+                {
+                    "message": build_email(subject="Two", to_addr="user@mail.example.test"),
+                    "envelope_rcpt": "user@mail.example.test",
+                },
+            ],
         )
-        insert_attachment(
+        insert_attachments(
             settings_obj,
-            message_id=first["id"],
-            filename="one.pdf",
-            content_type="application/pdf",
-            content=b"one",
-        )
-        insert_attachment(
-            settings_obj,
-            message_id=second["id"],
-            filename="two.pdf",
-            content_type="application/pdf",
-            content=b"two",
+            [
+                {
+                    "message_id": first["id"],
+                    "filename": "one.pdf",
+                    "content_type": "application/pdf",
+                    "content": b"one",
+                },
+                {
+                    "message_id": second["id"],
+                    "filename": "two.pdf",
+                    "content_type": "application/pdf",
+                    "content": b"two",
+                },
+            ],
         )
         csrf_token = get_csrf_token(client)
 
@@ -96,3 +104,40 @@ def test_admin_clear_messages_removes_all(tmp_path, monkeypatch) -> None:
         assert _fetch_message_ids(settings_obj) == set()
         assert Path(first["eml_path"]).exists() is False
         assert Path(second["eml_path"]).exists() is False
+        with db.get_connection(settings_obj.db_path) as conn:
+            deleted_events = {
+                int(row["message_id"])
+                for row in conn.execute(
+                    "SELECT message_id FROM inbox_events WHERE event_type = 'deleted'"
+                )
+            }
+        assert deleted_events == {first["id"], second["id"]}
+
+
+def test_inbox_revalidates_after_admin_delete(tmp_path, monkeypatch) -> None:
+    with build_client(tmp_path, monkeypatch) as (client, settings_obj):
+        unlock_admin(client, pin="1234")
+        message_row = insert_message(
+            settings_obj,
+            message=build_email(subject="Gone soon", to_addr="user@mail.example.test"),
+            envelope_rcpt="user@mail.example.test",
+        )
+
+        before = client.get("/inbox")
+        assert before.status_code == 200
+        assert before.headers["cache-control"] == "private, no-cache"
+        etag = before.headers["etag"]
+        assert "Gone soon" in before.text
+        assert client.get("/inbox", headers={"If-None-Match": etag}).status_code == 304
+
+        response = client.post(
+            f"/admin/message/{message_row['id']}/delete",
+            data={"csrf_token": get_csrf_token(client)},
+        )
+
+        assert response.status_code == 200
+        assert response.url.path == "/inbox"
+        after = client.get("/inbox", headers={"If-None-Match": etag})
+        assert after.status_code == 200
+        assert after.headers["etag"] != etag
+        assert "Gone soon" not in after.text
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import sqlite3
+
 import pytest
 
 from quail import db, web
+from quail.security import verify_pin
 from tests.helpers import build_client, get_csrf_token, unlock_admin
 
 pytestmark = pytest.mark.api
@@ -57,3 +60,152 @@ def test_admin_settings_rejects_bad_values(tmp_path, monkeypatch) -> None:
         assert db.get_setting(settings_obj.db_path, web.RETENTION_DAYS_KEY) == (
             web.DEFAULT_RETENTION_DAYS
         )
+
+
+def test_admin_settings_view_log_flushed_on_shutdown(tmp_path, monkeypatch) -> None:
+    with build_client(tmp_path, monkeypatch) as (client, settings_obj):
+        unlock_admin(client, pin="1234")
+
+        response = client.get("/admin/settings")
+
+        assert response.status_code == 200
+
+    with db.get_connection(settings_obj.db_path) as conn:
+        actions = [row["action"] for row in conn.execute("SELECT action FROM admin_actions")]
+
+    assert "admin_settings_view" in actions
+
+
+def test_admin_unlock_logs_session_with_its_state(tmp_path, monkeypatch) -> None:
+    with build_client(tmp_path, monkeypatch) as (client, settings_obj):
+        unlock_admin(client, pin="1234")
+
+        with db.get_connection(settings_obj.db_path) as conn:
+            actions = [row["action"] for row in conn.execute("SELECT action FROM admin_actions")]
+
+    assert actions == ["admin_pin_initialized", "admin_unlock"]
+    assert db.get_setting(settings_obj.db_path, "admin_session_hash")
+
+
+def test_admin_unlock_rate_limits_after_failed_attempts(tmp_path, monkeypatch) -> None:
+    with build_client(tmp_path, monkeypatch) as (client, _settings_obj):
+        unlock_admin(client)
+        csrf_token = get_csrf_token(client)
+        for _ in range(web.ADMIN_RATE_LIMIT_MAX_ATTEMPTS):
+            response = client.post(
+                "/admin/unlock",
+                data={"pin": "9999", "csrf_token": csrf_token},
+                follow_redirects=False,
+            )
+            assert response.headers["location"].endswith("error=invalid")
+
+        response = client.post(
+            "/admin/unlock",
+            data={"pin": "1234", "csrf_token": csrf_token},
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 303
+        assert response.headers["location"].endswith("error=rate_limited")
+
+
+def test_admin_session_check_skips_pin_hashing(tmp_path, monkeypatch) -> None:
+    calls = []
+
+    def counting_verify(pin: str, pin_hash: str) -> bool:
+        calls.append(pin)
+        return verify_pin(pin, pin_hash)
+
+    monkeypatch.setattr(web, "verify_pin", counting_verify)
+    with build_client(tmp_path, monkeypatch) as (client, _settings_obj):
+        unlock_admin(client)
+        calls.clear()
+
+        for _ in range(2):
+            response = client.get("/admin/settings", follow_redirects=False)
+            assert response.status_code == 200
+
+        assert calls == []
+
+
+def test_admin_session_expires_at_epoch_deadline(tmp_path, monkeypatch) -> None:
+    with build_client(tmp_path, monkeypatch) as (client, settings_obj):
+        unlock_admin(client)
+        expires_at = db.get_setting(settings_obj.db_path, "admin_session_expires_at")
+        assert expires_at is not None and expires_at.isdigit()
+
+        db.set_setting(settings_obj.db_path, "admin_session_expires_at", "1")
+        response = client.get("/admin/settings", follow_redirects=False)
+
+        assert response.status_code == 303
+
+
+def test_normalize_mime_list_dedupes_in_order() -> None:
+    assert web._normalize_mime_list(" Image/PNG, application/pdf,,image/png ") == (
+        "image/png,application/pdf"
+    )
+
+
+def test_is_admin_checks_session_once_per_request(monkeypatch) -> None:
+    from starlette.requests import Request
+
+    calls = []
+
+    def fake_is_admin_token(token):
+        calls.append(token)
+        return True
+
+    monkeypatch.setattr(web, "_is_admin_token", fake_is_admin_token)
+    request = Request({"type": "http", "headers": [(b"cookie", b"quail_admin_session=abc")]})
+
+    assert web._is_admin(request) is True
+    assert web._is_admin(request) is True
+    assert calls == ["abc"]
+
+
+def test_verify_admin_pin_caches_success_until_pin_changes(tmp_path, monkeypatch) -> None:
+    calls = []
+
+    def counting_verify(pin: str, pin_hash: str) -> bool:
+        calls.append(pin)
+        return verify_pin(pin, pin_hash)
+
+    monkeypatch.setattr(web, "verify_pin", counting_verify)
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+    db.set_setting(db_path, web.ADMIN_PIN_HASH_KEY, web.hash_pin("1234"))
+
+    assert web._verify_admin_pin(db_path, "1234") is True
+    assert web._verify_admin_pin(db_path, "1234") is True
+    assert web._verify_admin_pin(db_path, "9999") is False
+    assert calls == ["1234", "9999"]
+
+    db.set_setting(db_path, web.ADMIN_PIN_HASH_KEY, web.hash_pin("5678"))
+
+    assert web._verify_admin_pin(db_path, "1234") is False
+    assert calls == ["1234", "9999", "1234"]
+
+
+def test_admin_log_flush_requeues_rows_when_write_fails(tmp_path, monkeypatch) -> None:
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+    real_log_admin_actions = db.log_admin_actions
+    failures = [sqlite3.OperationalError("database is locked")]
+
+    def flaky_log_admin_actions(path, rows):
+        if failures:
+            raise failures.pop()
+        real_log_admin_actions(path, rows)
+
+    monkeypatch.setattr(db, "log_admin_actions", flaky_log_admin_actions)
+    for action in ("first", "second"):
+        web.ADMIN_LOG_QUEUE.put_nowait((db_path, (action, "admin", None, None, None, "", 1)))
+
+    with pytest.raises(sqlite3.OperationalError):
+        web._flush_admin_log_queue()
+    web.ADMIN_LOG_QUEUE.put_nowait((db_path, ("third", "admin", None, None, None, "", 2)))
+
+    assert web._flush_admin_log_queue() == 3
+    with db.get_connection(db_path) as conn:
+        actions = [row["action"] for row in conn.execute("SELECT action FROM admin_actions")]
+    assert actions == ["first", "second", "third"]
@@ -20,6 +20,12 @@ def test_css_bundle_matches_partials() -> None:
     assert not missing, f"Missing CSS partials: {missing}"
     assert bundle_path.exists(), "Missing CSS bundle. Run `make css-bundle`."
 
-    expected = "".join(path.read_text(encoding="utf-8") for path in parts)
-    actual = bundle_path.read_text(encoding="utf-8")
-    assert actual == expected, "CSS bundle is stale. Run `make css-bundle`."
+    actual = bundle_path.read_bytes()
+    offset = 0
+    for path in parts:
+        chunk = path.read_bytes()
+        assert (
+            actual[offset : offset + len(chunk)] == chunk
+        ), f"CSS bundle is stale at {path.name}. Run `make css-bundle`."
+        offset += len(chunk)
+    assert offset == len(actual), "CSS bundle is stale. Run `make css-bundle`."
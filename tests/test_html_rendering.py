@@ -61,3 +61,22 @@ def test_message_detail_skips_minimal_marker_for_rich_html(tmp_path, monkeypatch
 
         assert response.status_code == 200
         assert 'data-minimal="true"' not in response.text
+
+
+def test_message_detail_revalidates_with_etag(tmp_path, monkeypatch) -> None:
+    with build_client(tmp_path, monkeypatch) as (client, settings_obj):
+        message = build_email(subject="Cached", to_addr="user@mail.example.test")
+        message_row = insert_message(
+            settings_obj, message=message, envelope_rcpt="user@mail.example.test"
+        )
+
+        first = client.get(f"/message/{message_row['id']}")
+        etag = first.headers["etag"]
+        second = client.get(f"/message/{message_row['id']}", headers={"if-none-match": etag})
+
+        db.set_setting(settings_obj.db_path, web.ALLOW_HTML_KEY, "true")
+        third = client.get(f"/message/{message_row['id']}", headers={"if-none-match": etag})
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert third.status_code == 200
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from tests.helpers import build_client, build_email, insert_message
+from quail.web import InboxHub
+from tests.helpers import build_client, build_email, insert_messages
 
 pytestmark = pytest.mark.api
 
@@ -16,17 +18,20 @@ def test_inbox_api_contract(tmp_path, monkeypatch) -> None:
         now = datetime.now(tz=timezone.utc)
         message_a = build_email(subject="First", to_addr="user@mail.example.test")
         message_b = build_email(subject="Second", to_addr="user@mail.example.test")
-        insert_message(
+        insert_messages(
             settings_obj,
-            message=message_a,
-            envelope_rcpt="user@mail.example.test",
-            received_at=now - timedelta(minutes=10),
-        )
-        insert_message(
-            settings_obj,
-            message=message_b,
-            envelope_rcpt="user@mail.example.test",
-            received_at=now,
+            [
+                {
+                    "message": message_a,
+                    "envelope_rcpt": "user@mail.example.test",
+                    "received_at": now - timedelta(minutes=10),
+                },
+                {
+                    "message": message_b,
+                    "envelope_rcpt": "user@mail.example.test",
+                    "received_at": now,
+                },
+            ],
         )
 
         response = client.get("/api/inbox")
@@ -38,3 +43,19 @@ def test_inbox_api_contract(tmp_path, monkeypatch) -> None:
         assert len(payload["messages"]) == 2
         assert payload["messages"][0]["subject"] == "Second"
         assert payload["messages"][1]["subject"] == "First"
+
+
+class _StubSocket:
+    async def accept(self) -> None:
+        return None
+
+
+def test_inbox_hub_drops_empty_connection_keys() -> None:
+    async def scenario() -> dict:
+        hub = InboxHub()
+        ws = _StubSocket()
+        await hub.connect(ws, "user@mail.example.test", False, 20)
+        await hub.disconnect(ws, "user@mail.example.test", False, 20)
+        return hub.connections
+
+    assert asyncio.run(scenario()) == {}
@@ -187,13 +187,13 @@ def test_purge_removes_expired_admin_actions(tmp_path, monkeypatch) -> None:
         settings_obj.db_path,
         "admin_old_action",
         "127.0.0.1",
-        (now - timedelta(days=31)).isoformat(),
+        int((now - timedelta(days=31)).timestamp()),
     )
     db.log_admin_action(
         settings_obj.db_path,
         "admin_recent_action",
         "127.0.0.1",
-        (now - timedelta(days=1)).isoformat(),
+        int((now - timedelta(days=1)).timestamp()),
     )
 
     assert purge.main() == 0
@@ -7,9 +7,10 @@ from datetime import datetime, timezone
 
 import pytest
 
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
-from quail import db, settings
+from quail import db, settings, web
 from quail.web import app
 from tests.helpers import get_csrf_token
 
@@ -152,3 +153,103 @@ def test_quarantine_delete_endpoint(tmp_path, monkeypatch) -> None:
         assert row is None
         assert not eml_path.exists()
         assert not attachment_path.exists()
+
+
+def test_parse_message_ids_skips_non_numeric_and_caps_batch() -> None:
+    assert web._parse_message_ids(["3", "x", "-1", "", "12"]) == [3, 12]
+    with pytest.raises(HTTPException):
+        web._parse_message_ids(["1"] * (web.MAX_BATCH_MESSAGE_IDS + 1))
+
+
+def test_quarantine_bulk_restore_logs_each_message(tmp_path, monkeypatch) -> None:
+    with _build_client(tmp_path, monkeypatch) as client:
+        _unlock_admin(client, pin="1234")
+        csrf_token = get_csrf_token(client)
+        settings_obj = settings.get_settings()
+        settings_obj.eml_dir.mkdir(parents=True, exist_ok=True)
+        message_ids = []
+        for name in ("first", "second"):
+            eml_path = settings_obj.eml_dir / f"{name}.eml"
+            eml_path.write_text(f"Subject: {name}\n\nBody")
+            message_ids.append(
+                _insert_quarantined_message(settings_obj.db_path, eml_path, "Held for review")
+            )
+
+        response = client.post(
+            "/admin/quarantine/restore",
+            data={"message_id": [str(message_id) for message_id in message_ids]},
+            headers={
+                "accept": "application/json",
+                "x-admin-pin": "1234",
+                "x-csrf-token": csrf_token,
+            },
+        )
+        assert response.status_code == 200
+
+        with db.get_connection(settings_obj.db_path) as conn:
+            actions = [
+                row["action"]
+                for row in conn.execute(
+                    "SELECT action FROM admin_actions WHERE action LIKE 'admin_quarantine_restore:%'"
+                    " ORDER BY id"
+                )
+            ]
+        assert actions == [f"admin_quarantine_restore:{message_id}" for message_id in message_ids]
+
+
+def test_quarantine_rule_from_selection_dedupes_rules(tmp_path, monkeypatch) -> None:
+    with _build_client(tmp_path, monkeypatch) as client:
+        _unlock_admin(client, pin="1234")
+        csrf_token = get_csrf_token(client)
+        settings_obj = settings.get_settings()
+        settings_obj.eml_dir.mkdir(parents=True, exist_ok=True)
+        message_ids = []
+        for name in ("first", "second"):
+            eml_path = settings_obj.eml_dir / f"{name}.eml"
+            eml_path.write_text(f"Subject: {name}\n\nBody")
+            message_ids.append(
+                _insert_quarantined_message(settings_obj.db_path, eml_path, "Held for review")
+            )
+
+        response = client.post(
+            "/admin/quarantine/rule-from-selection",
+            data={
+                "message_id": [str(message_id) for message_id in message_ids],
+                "rule_type": "ALLOW",
+                "match_field": "MAIL_FROM",
+            },
+            headers={
+                "accept": "application/json",
+                "x-admin-pin": "1234",
+                "x-csrf-token": csrf_token,
+            },
+        )
+        assert response.status_code == 200
+        (rule_id,) = response.json()["created_rule_ids"]
+
+        rule = db.get_address_rule(settings_obj.db_path, rule_id)
+        assert rule["domain"] == "mail.example.test"
+        assert rule["pattern"] == r"^sender@example\.com$"
+        assert rule["action"] == "INBOX"
+
+        response = client.post(
+            "/admin/quarantine/delete",
+            data={"message_id": [str(message_id) for message_id in message_ids]},
+            headers={
+                "accept": "application/json",
+                "x-admin-pin": "1234",
+                "x-csrf-token": csrf_token,
+            },
+        )
+        assert response.status_code == 200
+
+        with db.get_connection(settings_obj.db_path) as conn:
+            remaining = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+            deleted_events = [
+                row["message_id"]
+                for row in conn.execute(
+                    "SELECT message_id FROM inbox_events WHERE event_type = 'deleted' ORDER BY id"
+                )
+            ]
+        assert remaining == 0
+        assert sorted(deleted_events) == message_ids
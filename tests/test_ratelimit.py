@@ -0,0 +1,50 @@
+"""Tests for the in-process admin rate limiter."""
+
+from __future__ import annotations
+
+import pytest
+
+from quail.ratelimit import SlidingWindowLimiter
+
+pytestmark = pytest.mark.unit
+
+
+def test_limiter_blocks_after_max_attempts_within_window() -> None:
+    limiter = SlidingWindowLimiter(max_attempts=3, window_seconds=60)
+    for offset in range(3):
+        assert limiter.is_limited("10.0.0.1", 1000 + offset) is False
+        limiter.record_failure("10.0.0.1", 1000 + offset)
+
+    assert limiter.is_limited("10.0.0.1", 1010) is True
+    assert limiter.is_limited("10.0.0.2", 1010) is False
+
+
+def test_limiter_slides_and_drops_idle_keys() -> None:
+    limiter = SlidingWindowLimiter(max_attempts=2, window_seconds=60)
+    limiter.record_failure("10.0.0.1", 1000)
+    limiter.record_failure("10.0.0.1", 1030)
+
+    assert limiter.is_limited("10.0.0.1", 1059) is True
+    assert limiter.is_limited("10.0.0.1", 1061) is False
+    assert limiter.is_limited("10.0.0.1", 1100) is False
+    assert limiter._failures == {}
+
+
+def test_limiter_reset_clears_key() -> None:
+    limiter = SlidingWindowLimiter(max_attempts=1, window_seconds=60)
+    limiter.record_failure("10.0.0.1", 1000)
+
+    limiter.reset("10.0.0.1")
+
+    assert limiter.is_limited("10.0.0.1", 1001) is False
+
+
+def test_limiter_sweeps_expired_keys_as_table_grows(monkeypatch) -> None:
+    monkeypatch.setattr(SlidingWindowLimiter, "MIN_SWEEP_THRESHOLD", 4)
+    limiter = SlidingWindowLimiter(max_attempts=5, window_seconds=60)
+    for index in range(3):
+        limiter.record_failure(f"10.0.0.{index}", 1000)
+
+    limiter.record_failure("10.0.1.1", 1100)
+
+    assert list(limiter._failures) == ["10.0.1.1"]
@@ -26,7 +26,6 @@ def test_init_db_creates_tables(tmp_path):
     assert "attachments" in table_names
     assert "settings" in table_names
     assert "admin_actions" in table_names
-    assert "admin_rate_limits" in table_names
 
 
 def test_get_retention_days_sets_default(tmp_path):
@@ -39,3 +38,106 @@ def test_get_retention_days_sets_default(tmp_path):
     assert db.get_setting(db_path, settings.SETTINGS_RETENTION_DAYS_KEY) == str(
         settings.DEFAULT_RETENTION_DAYS
     )
+
+
+def test_init_db_enables_wal_journal(tmp_path):
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert journal_mode == "wal"
+
+
+def test_init_db_indexes_inbox_list_query(tmp_path):
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM messages WHERE quarantined = 0"
+            " ORDER BY received_at DESC, id DESC LIMIT 200"
+        ).fetchall()
+
+    details = " ".join(row[3] for row in plan)
+    assert "idx_messages_quarantined_received" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_init_db_converts_legacy_admin_action_timestamps(tmp_path):
+    db_path = tmp_path / "quail.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE admin_actions (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " action TEXT NOT NULL, source_ip TEXT NOT NULL, performed_at TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO admin_actions (action, source_ip, performed_at)"
+            " VALUES ('admin_unlock', '127.0.0.1', '2026-01-01T00:00:00.123456+00:00')"
+        )
+
+    db.init_db(db_path)
+    db.log_admin_action(db_path, "admin_lock", "127.0.0.1", 1_767_225_700)
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT action, typeof(performed_at), performed_at FROM admin_actions ORDER BY id"
+        ).fetchall()
+
+    assert rows == [
+        ("admin_unlock", "integer", 1_767_225_600),
+        ("admin_lock", "integer", 1_767_225_700),
+    ]
+
+
+def test_pooled_connection_is_reused_per_thread(tmp_path):
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+
+    conn = db.get_pooled_connection(db_path)
+
+    assert db.get_pooled_connection(tmp_path / "quail.db") is conn
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+
+def test_cached_setting_refreshes_after_write(tmp_path):
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+    db.set_setting(db_path, "allow_html", "false")
+
+    assert db.get_cached_setting(db_path, "allow_html") == "false"
+
+    db.set_setting(db_path, "allow_html", "true")
+
+    assert db.get_cached_setting(db_path, "allow_html") == "true"
+
+
+def test_set_settings_writes_batch_and_refreshes_cache(tmp_path):
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+    db.set_setting(db_path, "allow_html", "false")
+    assert db.get_cached_setting(db_path, "allow_html") == "false"
+
+    db.set_settings(db_path, {"allow_html": "true", "retention_days": "7"})
+
+    assert db.get_cached_settings(db_path, ("allow_html", "retention_days", "missing")) == {
+        "allow_html": "true",
+        "retention_days": "7",
+        "missing": None,
+    }
+
+
+def test_cached_setting_expires_for_out_of_process_writes(tmp_path, monkeypatch):
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+    db.set_setting(db_path, "allow_html", "false")
+    assert db.get_cached_setting(db_path, "allow_html") == "false"
+
+    with db.get_connection(db_path) as conn:
+        conn.execute("UPDATE settings SET value = 'true' WHERE key = 'allow_html'")
+        conn.commit()
+    assert db.get_cached_setting(db_path, "allow_html") == "false"
+
+    monkeypatch.setattr(db, "SETTINGS_CACHE_TTL_SECONDS", 0.0)
+    assert db.get_cached_setting(db_path, "allow_html") == "true"
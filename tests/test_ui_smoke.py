@@ -9,7 +9,7 @@ from email.message import EmailMessage
 import pytest
 from fastapi.testclient import TestClient
 
-from quail import db, settings
+from quail import db, settings, web
 from quail.web import app
 
 pytestmark = pytest.mark.api
@@ -103,3 +103,59 @@ def test_admin_unlock_page_loads(tmp_path, monkeypatch) -> None:
     with _build_client(tmp_path, monkeypatch) as client:
         response = client.get("/admin/unlock")
         assert response.status_code == 200
+
+
+def test_anonymous_inbox_skips_session_lookup(tmp_path, monkeypatch) -> None:
+    def fail_session_lookup(_db_path):
+        raise AssertionError("session state read without an admin cookie")
+
+    monkeypatch.setattr(web, "_get_session_state", fail_session_lookup)
+    with _build_client(tmp_path, monkeypatch) as client:
+        response = client.get("/inbox")
+
+    assert response.status_code == 200
+
+
+def test_cached_admin_unlock_page_carries_request_csrf_token(tmp_path, monkeypatch) -> None:
+    with _build_client(tmp_path, monkeypatch) as client:
+        first = client.get("/admin/unlock?error=invalid")
+        client.cookies.clear()
+        second = client.get("/admin/unlock?error=invalid")
+
+    tokens = [response.cookies.get("quail_csrf") for response in (first, second)]
+    assert tokens[0] and tokens[1] and tokens[0] != tokens[1]
+    for response, token in zip((first, second), tokens):
+        assert f'value="{token}"' in response.text
+    assert web._CSRF_TOKEN_PLACEHOLDER not in second.text
+
+
+def test_healthz_reports_ok(tmp_path, monkeypatch) -> None:
+    with _build_client(tmp_path, monkeypatch) as client:
+        response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"status": "ok"}
+
+
+def test_storage_stats_sum_messages_and_attachments(tmp_path) -> None:
+    db_path = tmp_path / "quail.db"
+    db.init_db(db_path)
+    eml_path = tmp_path / "stats.eml"
+    _write_eml(eml_path, subject="Stats", to_addr="user@mail.example.test")
+    message_id = _insert_message(
+        db_path, eml_path=eml_path, envelope_rcpt="user@mail.example.test", subject="Stats"
+    )
+    with db.get_connection(db_path) as conn:
+        conn.execute(
+            "INSERT INTO attachments (message_id, filename, content_type, size_bytes, stored_path)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (message_id, "a.txt", "text/plain", 30, str(tmp_path / "a.txt")),
+        )
+        conn.commit()
+
+    assert web._get_storage_stats(db_path) == {
+        "message_count": 1,
+        "message_bytes": 12,
+        "attachment_bytes": 30,
+    }
@@ -0,0 +1,84 @@
+"""Unit tests for quail.web helper functions."""
+
+from __future__ import annotations
+
+from email.message import EmailMessage
+
+import pytest
+
+from quail import web
+
+pytestmark = pytest.mark.unit
+
+
+def test_parse_message_file_skips_inline_parts_with_filenames(tmp_path) -> None:
+    message = EmailMessage()
+    message["Subject"] = "Inline files"
+    message.set_content("Real body")
+    message.add_attachment("attached notes", disposition="inline", filename="notes.txt")
+    message.add_attachment(
+        "<p>inline html file</p>", subtype="html", disposition="inline", filename="page.html"
+    )
+    body_part, notes_part, html_part = message.get_payload()
+    message.set_payload([notes_part, body_part, html_part])
+    eml_path = tmp_path / "inline.eml"
+    eml_path.write_bytes(message.as_bytes())
+
+    body, html_body = web._parse_message_file(eml_path)
+
+    assert body.strip() == "Real body"
+    assert html_body is None
+
+
+@pytest.mark.parametrize("count", [1, web.FILE_DELETE_INLINE_MAX + 4])
+def test_delete_paths_removes_files_inline_and_pooled(tmp_path, count) -> None:
+    paths = [tmp_path / f"file-{index}.eml" for index in range(count)]
+    for path in paths:
+        path.write_bytes(b"x")
+
+    web._delete_paths(paths + [tmp_path / "missing.eml"])
+
+    assert not any(path.exists() for path in paths)
+
+
+@pytest.mark.parametrize(
+    ("size_bytes", "expected"),
+    [
+        (-1, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1.0 KB"),
+        (5 * 1024**2 + 512 * 1024, "5.5 MB"),
+        (3 * 1024**5, "3072.0 TB"),
+    ],
+)
+def test_format_bytes_picks_unit(size_bytes: int, expected: str) -> None:
+    assert web._format_bytes(size_bytes) == expected
+
+
+@pytest.mark.parametrize(
+    ("raw_value", "expected"),
+    [
+        ("sender@example.com", "sender@example.com"),
+        ("Sender <Sender@Example.com>", "Sender@Example.com"),
+        ('"Doe, Jane" <jane@example.com>', "jane@example.com"),
+        ("first@example.com, second@example.com", "first@example.com"),
+        ("", None),
+    ],
+)
+def test_extract_primary_address(raw_value: str, expected: str | None) -> None:
+    assert web._extract_primary_address(raw_value) == expected
+
+
+@pytest.mark.parametrize(
+    ("envelope_rcpt", "inbox_filter", "expected"),
+    [
+        ("qa-1@mail.example.test", "qa-*", True),
+        ("qa-1@mail.example.test", "qa-*@mail.example.test", True),
+        ("qa-1@other.example.test", "qa-*@mail.example.test", False),
+        ("dev@mail.example.test", "qa-*", False),
+        ("Dev@Mail.example.test", "dev@mail.example.test", True),
+        ("dev@mail.example.test", "ev", True),
+    ],
+)
+def test_matches_inbox_filter(envelope_rcpt: str, inbox_filter: str, expected: bool) -> None:
+    assert web._matches_inbox_filter(envelope_rcpt, inbox_filter) is expected